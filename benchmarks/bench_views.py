@@ -0,0 +1,174 @@
+"""
+Bench Views
+# Per-request overhead of Validator against undecorated views.
+    - scalar: Route and Query params only
+    - wide_json: Json body with 30 fields
+    - deep_json: List(Dict(int)) body with 500 items
+    - files: multipart upload of 3 files
+    - error: scalar view failing a rule (400)
+
+python -m benchmarks.bench_views [--number 1000] [--codegen] [--output result.json]
+"""
+import io
+import sys
+import json
+import argparse
+from inspect import Parameter, Signature
+from flask import Flask, request
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Route, Query, Json, File
+from flask_validation_extended.rules import MinLen, Min, Ext, MaxFileCount
+from flask_validation_extended.types import List, Dict
+from .harness import Scenario, compare, report
+
+WIDE_TYPES = (str, int, float)
+WIDE_FIELDS = tuple(f"field_{i}" for i in range(30))
+WIDE_BODY = {
+    name: WIDE_TYPES[i % 3](i) for i, name in enumerate(WIDE_FIELDS)
+}
+DEEP_BODY = {
+    "items": [{f"key_{j}": i * j for j in range(10)} for i in range(500)]
+}
+FILE_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096
+
+
+def _scalar_validated(
+        id=Route(int),
+        keyword=Query(str, rules=MinLen(2)),
+        page=Query(int, default=1, rules=Min(1)),
+        desc=Query(bool, default=False)
+):
+    return "ok"
+
+
+def _scalar_baseline(id):
+    args = request.args
+    args.get("keyword"), args.get("page"), args.get("desc")
+    return "ok"
+
+
+def _wide_validated(**fields):
+    return "ok"
+
+
+# 30개의 Json 파라미터를 직접 나열하는 대신, 시그니처를 생성하여 부여
+_wide_validated.__signature__ = Signature([
+    Parameter(
+        name, Parameter.KEYWORD_ONLY,
+        default=Json(WIDE_TYPES[i % 3])
+    )
+    for i, name in enumerate(WIDE_FIELDS)
+])
+
+
+def _wide_baseline():
+    data = request.get_json()
+    [data.get(name) for name in WIDE_FIELDS]
+    return "ok"
+
+
+def _deep_validated(items=Json(List(Dict(int)), rules=MinLen(1))):
+    return "ok"
+
+
+def _deep_baseline():
+    request.get_json()["items"]
+    return "ok"
+
+
+def _files_validated(
+        files=File(rules=[Ext(["png", "jpg"]), MaxFileCount(4)])
+):
+    return "ok"
+
+
+def _files_baseline():
+    request.files.getlist("files")
+    return "ok"
+
+
+VIEWS = (
+    ("/scalar/<int:id>", _scalar_validated, _scalar_baseline),
+    ("/wide", _wide_validated, _wide_baseline),
+    ("/deep", _deep_validated, _deep_baseline),
+    ("/files", _files_validated, _files_baseline),
+)
+
+
+def create_app(validator=None):
+    """
+    App with validated views, or undecorated baseline views if validator is None.
+    """
+    app = Flask(__name__)
+    for rule, validated, baseline in VIEWS:
+        view = baseline if validator is None else validator(validated)
+        app.add_url_rule(
+            rule, validated.__name__, view, methods=["GET", "POST"]
+        )
+    return app
+
+
+def _files_request():
+    return {
+        "path": "/files",
+        "method": "POST",
+        "data": {
+            "files": [
+                (io.BytesIO(FILE_BYTES), f"image_{i}.png") for i in range(3)
+            ]
+        },
+        "content_type": "multipart/form-data",
+    }
+
+
+SCENARIOS = (
+    Scenario("scalar", lambda: {
+        "path": "/scalar/1?keyword=flask&page=2&desc=true",
+    }),
+    Scenario("wide_json", lambda: {
+        "path": "/wide", "method": "POST", "json": WIDE_BODY,
+    }),
+    Scenario("deep_json", lambda: {
+        "path": "/deep", "method": "POST", "json": DEEP_BODY,
+    }),
+    Scenario("files", _files_request),
+    Scenario("error", lambda: {
+        "path": "/scalar/1?keyword=flask&page=0",
+    }, expected_status=400),
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=1000,
+                        help="timed requests per scenario and app")
+    parser.add_argument("--scenario", action="append",
+                        choices=[scenario.name for scenario in SCENARIOS])
+    parser.add_argument("--codegen", action="store_true")
+    parser.add_argument("--collect-errors", action="store_true")
+    parser.add_argument("--json-decoder", default=None)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    validator = Validator(
+        codegen=args.codegen,
+        collect_errors=args.collect_errors,
+        json_decoder=args.json_decoder,
+    )
+    baseline_client = create_app().test_client()
+    validated_client = create_app(validator).test_client()
+
+    results = [
+        compare(baseline_client, validated_client, scenario, args.number)
+        for scenario in SCENARIOS
+        if not args.scenario or scenario.name in args.scenario
+    ]
+    print(report(results))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
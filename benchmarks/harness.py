@@ -0,0 +1,122 @@
+"""
+Harness
+# Measure the cost Validator adds to a request, with Flask's test client.
+    - Latency: per-request timings (timeit.default_timer), p50 / p99.
+    - Allocations: peak traced memory of a request (tracemalloc).
+    - Overhead: validated view - undecorated baseline view.
+"""
+import gc
+import tracemalloc
+from timeit import default_timer
+from statistics import median
+
+
+class Scenario:
+    """
+    A request sent to a baseline app and a validated app.
+    make_request: returns the kwargs of client.open(), called per request
+                  (file streams can't be reused).
+    expected_status: status of the validated app (baseline is always 200).
+    """
+    def __init__(self, name, make_request, expected_status=200):
+        self.name = name
+        self.make_request = make_request
+        self.expected_status = expected_status
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+    return ordered[idx]
+
+
+def time_requests(client, scenario, number, expected_status, warmup=20):
+    """
+    Returns per-request timings in microseconds.
+    """
+    for _ in range(warmup):
+        res = client.open(**scenario.make_request())
+        if res.status_code != expected_status:
+            raise AssertionError(
+                f"[{scenario.name}] expected {expected_status}, "
+                f"got {res.status_code}: {res.get_data(as_text=True)}"
+            )
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(number):
+            kwargs = scenario.make_request()
+            start = default_timer()
+            client.open(**kwargs)
+            samples.append((default_timer() - start) * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples
+
+
+def peak_allocation(client, scenario, number=5):
+    """
+    Returns the median peak of traced memory per request, in bytes.
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            kwargs = scenario.make_request()
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            client.open(**kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+    finally:
+        tracemalloc.stop()
+    return median(peaks)
+
+
+def measure(client, scenario, number, expected_status):
+    samples = time_requests(client, scenario, number, expected_status)
+    return {
+        "p50": median(samples),
+        "p99": _percentile(samples, 99),
+        "peak_bytes": peak_allocation(client, scenario),
+    }
+
+
+def compare(baseline_client, validated_client, scenario, number):
+    """
+    Measure the scenario on both apps.
+    """
+    baseline = measure(baseline_client, scenario, number, 200)
+    validated = measure(
+        validated_client, scenario, number, scenario.expected_status
+    )
+    return {
+        "scenario": scenario.name,
+        "baseline": baseline,
+        "validated": validated,
+        "overhead_p50": validated["p50"] - baseline["p50"],
+        "overhead_p99": validated["p99"] - baseline["p99"],
+        "overhead_bytes": validated["peak_bytes"] - baseline["peak_bytes"],
+    }
+
+
+def report(results):
+    header = (
+        f"{'scenario':<16}{'base p50':>10}{'p50':>10}{'p99':>10}"
+        f"{'+p50 us':>10}{'+p99 us':>10}{'+alloc KiB':>12}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['scenario']:<16}"
+            f"{result['baseline']['p50']:>10.1f}"
+            f"{result['validated']['p50']:>10.1f}"
+            f"{result['validated']['p99']:>10.1f}"
+            f"{result['overhead_p50']:>10.1f}"
+            f"{result['overhead_p99']:>10.1f}"
+            f"{result['overhead_bytes'] / 1024:>12.1f}"
+        )
+    return "\n".join(lines)
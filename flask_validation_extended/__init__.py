@@ -1,43 +1,83 @@
-from .vaildator import Validator
-from .params import (
-    Route,
-    Query,
-    Form,
-    Header,
-    Json,
-    File
-)
-from .rules import (
-    ValidationRule,
-    MinLen,
-    MaxLen,
-    Min,
-    Max,
-    In,
-    Number,
-    Strip,
-    IsoDatetime,
-    Datetime,
-    Email,
-    PhoneNum,
-    Regex,
-    Ext,
-    MaxFileCount,
-    MinFileCount
-)
-from .types import (
-    All,
-    FileObj,
-    List,
-    Dict
-)
-from .utils import invalidate
-
+"""
+Flask Validation Extended
+# Public names are imported lazily, on first access.
+    - "import flask_validation_extended" only loads the exceptions.
+    - Flask, NumPy and the rules are imported when they are used.
+"""
+from importlib import import_module
+from . import exceptions as _exceptions
 from .exceptions import *
 
+_LAZY_ATTRIBUTES = {
+    ".vaildator": ("Validator",),
+    ".params": ("Route", "Query", "Form", "Header", "Json", "File"),
+    ".rules": (
+        "ValidationRule",
+        "AsyncValidationRule",
+        "Each",
+        "Cached",
+        "MinLen",
+        "MaxLen",
+        "Min",
+        "Max",
+        "Finite",
+        "In",
+        "Number",
+        "Strip",
+        "ConversionRule",
+        "IsoDatetime",
+        "Datetime",
+        "Uuid",
+        "IpAddress",
+        "Decimal",
+        "Coerce",
+        "Email",
+        "PhoneNum",
+        "Regex",
+        "RegexSet",
+        "Ext",
+        "MaxFileCount",
+        "MinFileCount",
+        "MaxFileSize",
+        "MaxTotalFileSize",
+        "ContentType",
+        "MagicBytes",
+    ),
+    ".types": ("All", "FileObj", "List", "Dict", "Object", "Field", "Batch"),
+    ".batch": ("validate_many", "BatchResult"),
+    ".core": ("validate", "validate_async", "compile_params"),
+    ".utils": ("invalidate",),
+}
+_LAZY_MODULES = {
+    name: module
+    for module, names in _LAZY_ATTRIBUTES.items() for name in names
+}
+
+
+__all__ = [
+    *(name for name in vars(_exceptions) if not name.startswith("_")),
+    *_LAZY_MODULES,
+]
+
+
+def __getattr__(name):
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(import_module(module, __name__), name)
+    # 다음 접근부터는 모듈 속성으로 바로 조회
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_MODULES})
+
 
 __AUTHOR__ = "IML"
 __VERSION__ = "0.2.1"
 
 # TODO: 변수 및 메소드 Private 처리하기
-# TODO: 커스텀 타입간의 비교 로직 구현 (커스텀룰 어노테이션 검증을 위함)
\ No newline at end of file
+# TODO: 커스텀 타입간의 비교 로직 구현 (커스텀룰 어노테이션 검증을 위함)
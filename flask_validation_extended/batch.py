@@ -0,0 +1,151 @@
+"""
+Batch
+# Validation of many records with one compiled schema.
+    - validate_many(records, schema): standalone batch API.
+    - Json(Batch(schema)): the same, as a Json param.
+    - Each record is checked by the compiled checker of the Object,
+      the reason is explained only for invalid records.
+    - With an executor, the records are validated in chunks (see parallel.py).
+"""
+from itertools import repeat
+from .types import Object, compile_type_check, compile_fill_defaults
+from .exceptions import InvalidBatchArgument
+from .parallel import chunked, DEFAULT_CHUNK_SIZE
+
+
+class BatchResult(list):
+    """
+    Valid records (with defaults filled), in order.
+    errors: [{"index": index of the record, "message": reason}, ...]
+    """
+    def __init__(self, records=(), errors=None, total=0):
+        super().__init__(records)
+        self.errors = [] if errors is None else errors
+        self.total = total
+
+
+def _validate_records(schema, records, valid, errors, start=0, max_errors=None):
+    """
+    Append valid records and errors of the records.
+    Returns the number of validated records.
+    """
+    check = compile_type_check(schema)
+    fill = compile_fill_defaults(schema)
+    accept = valid.append
+    count = 0
+    for index, record in enumerate(records, start):
+        count += 1
+        if check(record):
+            if fill is not None:
+                fill(record)
+            accept(record)
+            continue
+        errors.append({"index": index, "message": schema.explain(record)})
+        if max_errors is not None and len(errors) >= max_errors:
+            break
+    return count
+
+
+def validate_chunk(schema, max_errors, start, records):
+    """
+    (valid records, errors, count) of a chunk, in the worker.
+    """
+    valid, errors = [], []
+    count = _validate_records(schema, records, valid, errors, start, max_errors)
+    return valid, errors, count
+
+
+def _merge_chunks(result, starts, chunk_results, max_errors):
+    for start, (valid, errors, count) in zip(starts, chunk_results):
+        if max_errors is not None:
+            remaining = max_errors - len(result.errors)
+            if len(errors) >= remaining:
+                # 순차 검증과 같이, max_errors 번째 에러 이후의 레코드는 버림
+                errors = errors[:remaining]
+                count = errors[-1]["index"] - start + 1
+                del valid[count - len(errors):]
+                result.extend(valid)
+                result.errors.extend(errors)
+                result.total += count
+                return
+        result.extend(valid)
+        result.errors.extend(errors)
+        result.total += count
+
+
+def validate_many(
+        records,
+        schema,
+        partial=True,
+        max_errors=None,
+        executor=None,
+        chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Validate every record against the schema (Object or dict of fields).
+    partial: if False, no record is accepted when any of them is invalid.
+    max_errors: stop as soon as that many records are invalid (at least 1).
+    executor: concurrent.futures executor validating chunk_size records
+              per task, if there are more records than chunk_size.
+    """
+    if not isinstance(schema, Object):
+        schema = Object(schema)
+    if max_errors is not None and (
+        not isinstance(max_errors, int) or isinstance(max_errors, bool) or
+        max_errors < 1
+    ):
+        raise InvalidBatchArgument(max_errors)
+    result = BatchResult()
+
+    if executor is not None and not isinstance(records, list):
+        records = list(records)
+    if executor is None or len(records) <= chunk_size:
+        result.total = _validate_records(
+            schema, records, result, result.errors, max_errors=max_errors
+        )
+    else:
+        chunks = chunked(records, chunk_size)
+        chunk_results = executor.map(
+            validate_chunk, repeat(schema), repeat(max_errors),
+            *zip(*chunks)
+        )
+        _merge_chunks(
+            result, [start for start, _ in chunks], chunk_results, max_errors
+        )
+
+    if result.errors and not partial:
+        del result[:]
+    return result
+
+
+class BatchTransform:
+    """
+    Type check of a Json(Batch(...)) step, returns (value, check, message).
+    """
+    def __init__(self, step, batch, executor=None, chunk_size=None):
+        self.step = step
+        self.batch = batch
+        self.executor = executor
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self.too_many_message = (
+            f"{step.rule_prefix}must be at most {batch.max_records} records."
+        )
+
+    def __call__(self, records):
+        batch = self.batch
+        if not isinstance(records, list):
+            return None, "type", self.step.type_message
+        if batch.max_records is not None and len(records) > batch.max_records:
+            return None, "Batch", self.too_many_message
+        result = validate_many(
+            records, batch.schema, batch.partial, batch.max_errors,
+            self.executor, self.chunk_size
+        )
+        if result.errors and not batch.partial:
+            error = result.errors[0]
+            return None, "Batch", (
+                f"{self.step.rule_prefix}{len(result.errors)} of "
+                f"{result.total} records are invalid. "
+                f"(index {error['index']}: {error['message']})"
+            )
+        return result, None, None
@@ -0,0 +1,179 @@
+"""
+Codegen
+# Specialized validator source generated from a compiled plan.
+    - isinstance checks of single builtin annotations are inlined.
+    - int(), float() and bool conversions are inlined.
+    - rules are unrolled in declaration order.
+    - conversion rules of convert=True Params are inlined as try blocks.
+"""
+from .plans import _fetch_value, CONVERTERS, sources_of
+from .types import All, BUILTIN_TYPES
+from .rules import ConversionRule
+
+INDENT = " " * 4
+
+
+class _Writer:
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {}
+
+    def line(self, depth, text):
+        self.lines.append(INDENT * depth + text)
+
+    def bind(self, name, value):
+        self.namespace[name] = value
+        return name
+
+
+def _write_convert(w, depth, idx, step):
+    converter = step.converter
+    w.line(depth, f"if isinstance(value, {step.convert_type.__name__}):")
+    if converter is CONVERTERS[int] or converter is CONVERTERS[float]:
+        func = "int" if converter is CONVERTERS[int] else "float"
+        w.line(depth + 1, "try:")
+        w.line(depth + 2, f"value = {func}(value)")
+        w.line(depth + 1, "except ValueError:")
+        w.line(depth + 2, f"return None, {w.bind(f'_convert_{idx}', step.convert_message)}")
+    elif converter is CONVERTERS[bool]:
+        message = w.bind(f'_convert_{idx}', step.convert_message)
+        w.line(depth + 1, "lowered = value.lower()")
+        w.line(depth + 1, "if lowered == 'true':")
+        w.line(depth + 2, "value = True")
+        w.line(depth + 1, "elif lowered == 'false':")
+        w.line(depth + 2, "value = False")
+        w.line(depth + 1, "else:")
+        w.line(depth + 2, f"return None, {message}")
+    else:
+        w.line(depth + 1, f"value, status = {w.bind(f'_converter_{idx}', converter)}(value)")
+        w.line(depth + 1, "if not status:")
+        w.line(depth + 2, f"return None, {w.bind(f'_convert_{idx}', step.convert_message)}")
+
+
+def _write_type_check(w, depth, idx, step):
+    annotation = step.annotation
+    if step.transform is not None:
+        transform = w.bind(f'_transform_{idx}', step.transform)
+        w.line(depth, f"value, check, message = {transform}(value)")
+        w.line(depth, "if check is not None:")
+        w.line(depth + 1, "return None, message")
+        return
+    if len(annotation) == 1 and annotation[0] is All:
+        return
+    if len(annotation) == 1 and annotation[0] in BUILTIN_TYPES and not step.item_rules:
+        condition = f"not isinstance(value, {w.bind(f'_type_{idx}', annotation[0])})"
+    else:
+        condition = f"not {w.bind(f'_checker_{idx}', step.checker)}(value)"
+    w.line(depth, f"if {condition}:")
+    if step.item_rules:
+        w.line(depth + 1, f"return None, {w.bind(f'_check_failure_{idx}', step.check_failure)}(value)[1]")
+    elif step.explain is None:
+        w.line(depth + 1, f"return None, {w.bind(f'_type_message_{idx}', step.type_message)}")
+    else:
+        w.line(depth + 1, f"return None, {w.bind(f'_type_error_{idx}', step.type_error)}(value)")
+    if step.fill is not None:
+        w.line(depth, f"{w.bind(f'_fill_{idx}', step.fill)}(value)")
+
+
+def _write_rules(w, depth, idx, step):
+    if not step.rules:
+        return
+    prefix = w.bind(f'_prefix_{idx}', step.rule_prefix)
+    for r_idx, rule in enumerate(step.rules):
+        name = w.bind(f'_rule_{idx}_{r_idx}', rule)
+        if step.convert and isinstance(rule, ConversionRule):
+            w.line(depth, "try:")
+            w.line(depth + 1, f"value = {name}.convert(value)")
+            w.line(depth, "except ValueError:")
+            w.line(depth + 1, f"return None, {prefix} + {name}.invalid_str()")
+            continue
+        w.line(depth, f"if not {name}.is_valid(value):")
+        w.line(depth + 1, f"return None, {prefix} + {name}.invalid_str()")
+
+
+def _write_output(w, depth, idx, step):
+    # 비동기 Rule이 있는 경우, 비동기 Rule 이후에 변환 (execute_async)
+    if step.output is None or step.async_rules:
+        return
+    w.line(depth, f"value = {w.bind(f'_output_{idx}', step.output)}(value)")
+
+
+def _write_step(w, idx, step):
+    w.line(1, f"# {step.name}: {step.source.__name__}")
+    if step.fetch is _fetch_value:
+        w.line(1, f"value = src_{step.source.__name__}.get({step.lookup_key!r})")
+    else:
+        fetch = w.bind(f'_fetch_{idx}', step.fetch)
+        w.line(1, f"value = {fetch}(src_{step.source.__name__}, {step.lookup_key!r})")
+
+    checks = []
+    if step.converter is not None:
+        checks.append(_write_convert)
+    if step.checker is not None:
+        checks.append(_write_type_check)
+
+    if step.default is not None:
+        w.line(1, "if value is None:")
+        w.line(2, f"value = {w.bind(f'_default_{idx}', step.default)}")
+        if checks:
+            w.line(1, "else:")
+            for write in checks:
+                write(w, 2, idx, step)
+        _write_rules(w, 1, idx, step)
+        _write_output(w, 1, idx, step)
+        w.line(1, f"arg_{idx} = value")
+    elif step.required:
+        w.line(1, "if value is None:")
+        w.line(2, f"return None, {w.bind(f'_missing_{idx}', step.missing_message)}")
+        for write in checks:
+            write(w, 1, idx, step)
+        _write_rules(w, 1, idx, step)
+        _write_output(w, 1, idx, step)
+        w.line(1, f"arg_{idx} = value")
+    else:
+        w.line(1, "if value is None:")
+        w.line(2, f"arg_{idx} = None")
+        w.line(1, "else:")
+        for write in checks:
+            write(w, 2, idx, step)
+        _write_rules(w, 2, idx, step)
+        _write_output(w, 2, idx, step)
+        w.line(2, f"arg_{idx} = value")
+
+
+def generate(plan, name="validate"):
+    """
+    Generate the source of a flat validator function for the plan.
+    Returns (source, namespace).
+    """
+    w = _Writer()
+    w.line(0, f"def {name}(sources):")
+    for source in sources_of(plan):
+        bound = w.bind(f'_{source.__name__}', source)
+        w.line(1, f"src_{source.__name__} = sources[{bound}]")
+
+    for idx, step in enumerate(plan):
+        _write_step(w, idx, step)
+
+    items = ", ".join(
+        f"{step.name!r}: arg_{idx}" for idx, step in enumerate(plan)
+    )
+    w.line(1, f"return {{{items}}}, None")
+    return "\n".join(w.lines) + "\n", w.namespace
+
+
+def compile_plan_source(plan, view_name):
+    """
+    Compile the generated validator of the plan.
+    Returns (function, source).
+    """
+    source, namespace = generate(plan)
+    filename = f"<flask_validation_extended {view_name}>"
+    exec(compile(source, filename, "exec"), namespace)
+    # 트레이스백에서 생성된 코드를 확인할 수 있도록 등록
+    import linecache
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename
+    )
+    return namespace["validate"], source
@@ -0,0 +1,179 @@
+"""
+Core
+# Framework-free validation with the same Params and rules.
+    - compile_params(params): compile {name: Param} into a plan, once.
+    - validate(plan, sources): validate plain mappings, no request needed.
+    - compile_runner(plan): sync / async runners of a plan,
+      shared with the Flask Validator (see vaildator.py).
+
+plan = compile_params({"user_id": Json(int), "token": Header(str)})
+for message in consumer:
+    inputs, error = validate(plan, {"json": message.value, "header": message.headers})
+"""
+from functools import partial
+from .params import Route, Query, Form, Header, Json, File
+from .plans import (
+    Step, SOURCES, compile_steps, environ_key, sources_of,
+    execute, execute_all, execute_async, execute_async_all
+)
+from .codegen import compile_plan_source
+from .exceptions import (
+    InvalidParameter, InvalidAsyncRule, InvalidSource, InvalidMaxErrors
+)
+
+SOURCE_NAMES = {
+    "route": Route,
+    "query": Query,
+    "form": Form,
+    "header": Header,
+    "json": Json,
+    "file": File,
+}
+
+
+def compile_params(params, **options):
+    """
+    Compile {name: Param} into a plan.
+    options: numpy_threshold, numpy_output, executor, executor_threshold
+    """
+    if isinstance(params, tuple) and all(
+        isinstance(step, Step) for step in params
+    ):
+        return params
+    for name, param in params.items():
+        if param.__class__ not in SOURCES:
+            raise InvalidParameter("params", name)
+    return compile_steps(params.items(), **options)
+
+
+def check_max_errors(max_errors):
+    """
+    max_errors must be None or an int of at least 1.
+    """
+    if max_errors is not None and (
+        not isinstance(max_errors, int) or isinstance(max_errors, bool) or
+        max_errors < 1
+    ):
+        raise InvalidMaxErrors(max_errors)
+    return max_errors
+
+
+def compile_runner(
+        plan, collect_errors=False, max_errors=None, codegen=False,
+        name="validate"
+):
+    """
+    (run, run_async, async_steps, validation_source) of the plan.
+    run(sources) -> (parsed_inputs, error)
+    run_async(parsed_inputs, error) -> error, only if async_steps exist.
+    """
+    validation_source = None
+    if collect_errors:
+        # 모든 실패를 수집하는 경우, codegen 없이 계획을 순회
+        run = partial(execute_all, plan, max_errors=max_errors)
+    elif codegen:
+        run, validation_source = compile_plan_source(plan, name)
+    else:
+        run = partial(execute, plan)
+
+    async_steps = tuple(step for step in plan if step.async_rules)
+    if collect_errors:
+        run_async = partial(
+            execute_async_all, async_steps, max_errors=max_errors
+        )
+    else:
+        run_async = partial(execute_async, async_steps)
+    return run, run_async, async_steps, validation_source
+
+
+class MultiValues:
+    """
+    get / getlist of a plain mapping for Query, Form and File.
+    A list value is multiple values of the key.
+    """
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    def get(self, key):
+        value = self.mapping.get(key)
+        if isinstance(value, (list, tuple)):
+            return value[0] if value else None
+        return value
+
+    def getlist(self, key):
+        value = self.mapping.get(key)
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple)):
+            return list(value)
+        return [value]
+
+
+def _source_key(key):
+    if isinstance(key, str):
+        source = SOURCE_NAMES.get(key.lower())
+    else:
+        source = key if key in SOURCES else None
+    if source is None:
+        raise InvalidSource(key)
+    return source
+
+
+def prepare_sources(plan, sources):
+    """
+    {Param class: source} of the plan, from {"json": ..., "header": ...}.
+    Missing sources are empty.
+    """
+    given = {_source_key(key): value for key, value in sources.items()}
+    prepared = {}
+    for source in sources_of(plan):
+        value = given.get(source)
+        if value is None:
+            value = {}
+        if source is Header:
+            # Step은 Header를 WSGI environ key로 조회
+            value = {environ_key(name): item for name, item in value.items()}
+        elif source in (Query, Form, File) and not hasattr(value, "getlist"):
+            value = MultiValues(value)
+        prepared[source] = value
+    return prepared
+
+
+def validate(params, sources, collect_errors=False, max_errors=None):
+    """
+    Validate the sources with params ({name: Param} or a compiled plan).
+    Returns (parsed_inputs, error_message),
+    or (parsed_inputs, failures) if collect_errors.
+    """
+    check_max_errors(max_errors)
+    plan = compile_params(params)
+    if any(step.async_rules for step in plan):
+        raise InvalidAsyncRule(
+            next(step for step in plan if step.async_rules)
+            .async_rules[0].__class__.__name__
+        )
+    prepared = prepare_sources(plan, sources)
+    if collect_errors:
+        return execute_all(plan, prepared, max_errors)
+    return execute(plan, prepared)
+
+
+async def validate_async(params, sources, collect_errors=False, max_errors=None):
+    """
+    validate() with async rules, evaluated after every sync check.
+    """
+    check_max_errors(max_errors)
+    plan = compile_params(params)
+    async_steps = tuple(step for step in plan if step.async_rules)
+    prepared = prepare_sources(plan, sources)
+    if collect_errors:
+        parsed_inputs, failures = execute_all(plan, prepared, max_errors)
+        failures = await execute_async_all(
+            async_steps, parsed_inputs, failures, max_errors
+        )
+        return parsed_inputs, failures
+    parsed_inputs, error = execute(plan, prepared)
+    error = await execute_async(async_steps, parsed_inputs, error)
+    if error is not None:
+        return None, error
+    return parsed_inputs, None
@@ -0,0 +1,82 @@
+"""
+Decoders
+# JSON decoder backends for Json params.
+    - "auto": the fastest installed one of orjson, simdjson, ujson, json.
+    - module name: "orjson", "simdjson", "ujson", "json"
+    - callable: any loads(bytes) function
+    - The decoded body is shared with request.get_json() through Werkzeug's
+      Request._cached_json (normal, silent) cache, only if it has that shape.
+"""
+from importlib import import_module
+from flask import request, Request
+
+JSON_BACKENDS = ("orjson", "simdjson", "ujson", "json")
+
+# Werkzeug 2.3+ : Request._cached_json = (normal, silent), Ellipsis if not decoded
+# 구조가 다르면 캐시를 공유하지 않고, 본문만 디코딩
+JSON_CACHE = getattr(Request, "_cached_json", None) == (Ellipsis, Ellipsis)
+
+
+def find_json_decoder(backends=JSON_BACKENDS):
+    """
+    Returns loads function of the first installed backend.
+    """
+    for backend in backends:
+        try:
+            return import_module(backend).loads
+        except ImportError:
+            continue
+    raise ImportError(f"None of JSON backends {backends} is installed.")
+
+
+def resolve_json_decoder(decoder):
+    if decoder == "auto":
+        return find_json_decoder()
+    if isinstance(decoder, str):
+        return find_json_decoder((decoder,))
+    if callable(decoder):
+        return decoder
+    raise TypeError('"json_decoder" must be "auto", a module name or callable.')
+
+
+def get_cached_json():
+    """
+    Body cached by request.get_json(silent=True), Ellipsis if not decoded yet.
+    """
+    if not JSON_CACHE:
+        return Ellipsis
+    return request._cached_json[True]
+
+
+def set_cached_json(data, failed=False):
+    """
+    Cache the decoded body for request.get_json(),
+    or only for get_json(silent=True) if the body is invalid.
+    """
+    if not JSON_CACHE:
+        return
+    if failed:
+        request._cached_json = (request._cached_json[0], None)
+    else:
+        request._cached_json = (data, data)
+
+
+def make_json_loader(decoder):
+    """
+    Json source loader decoding the body with the given decoder.
+    The decoded body is cached on the request like request.get_json(),
+    so the view can call request.get_json() without decoding it again.
+    """
+    def load_json(kwargs):
+        data = get_cached_json()
+        if data is Ellipsis:
+            data = None
+            if request.is_json:
+                try:
+                    data = decoder(request.get_data(cache=True))
+                except ValueError:
+                    set_cached_json(None, failed=True)
+                else:
+                    set_cached_json(data)
+        return data or {}
+    return load_json
@@ -72,6 +72,55 @@ class InvalidOptional(Exception):
         return '"optional" must be one of (True, False).'
 
 
+class InvalidBatchArgument(InvalidAnnotation):
+
+    def __str__(self):
+        return (
+            f'{self.param!r} is an invalid argument of Batch. '
+            f'(schema: types.Object() or dict, partial: bool, '
+            f'max_errors: int >= 1, max_records: int)'
+        )
+
+
+class InvalidListStyle(Exception):
+
+    def __init__(self, style):
+        self.style = style
+
+    def __str__(self):
+        return (
+            f'"style" must be one of ("repeat", "comma", "brackets"), '
+            f'not {self.style!r}.'
+        )
+
+
+class InvalidConvert(Exception):
+
+    def __str__(self):
+        return '"convert" must be one of (True, False).'
+
+
+class InvalidConvertRule(Exception):
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def __str__(self):
+        return (
+            f'Cached "{self.rule}" can\'t convert the data. '
+            f'With convert=True, use the conversion rule without Cached.'
+        )
+
+
+class InvalidMaxErrors(Exception):
+
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+
+    def __str__(self):
+        return f'"max_errors" must be None or an int of at least 1, not {self.max_errors!r}.'
+
+
 class InvalidRuleParameter(Exception):
 
     def __init__(self, param, valid_type):
@@ -85,4 +134,38 @@ class InvalidRuleParameter(Exception):
 class EmptyTupleException(Exception):
 
     def __str__(self):
-        return "args must be in filled."
\ No newline at end of file
+        return "args must be in filled."
+
+class InvalidParameter(Exception):
+
+    def __init__(self, view, param):
+        self.view = view
+        self.param = param
+
+    def __str__(self):
+        return (
+            f'"{self.param}" of "{self.view}" is invalid. '
+            f'Its default must be one of '
+            f'(Route, Query, Form, Header, Json, File).'
+        )
+
+
+class InvalidSource(Exception):
+
+    def __init__(self, source):
+        self.source = source
+
+    def __str__(self):
+        return (
+            f'"{self.source}" is not a source of params. '
+            f'(route, query, form, header, json, file)'
+        )
+
+
+class InvalidAsyncRule(Exception):
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def __str__(self):
+        return f'Async rule "{self.rule}" can only be used in async views.'
@@ -0,0 +1,110 @@
+"""
+Instrument
+# Timing hooks of the validation, per param and per rule.
+    - on_param_validated(event): after each param is validated.
+    - on_rule_evaluated(event): after each sync / async rule is evaluated.
+    - Only the observed copy of a plan is instrumented,
+      so a Validator without hooks runs the plan as is.
+"""
+from time import perf_counter_ns
+from collections import namedtuple
+from .plans import Step
+from .rules import ConversionRule
+
+# 파라미터 이벤트의 경우 rule은 None
+ValidationEvent = namedtuple(
+    "ValidationEvent",
+    ["view", "source", "field", "rule", "elapsed_ns", "valid"]
+)
+
+
+class ObservedStep(Step):
+    """
+    Step calling the hooks with the elapsed time of the param and its rules.
+    Rules of Each are evaluated within the type check, so they are
+    counted in the elapsed time of the param.
+    """
+    def __init__(self, step, view, on_param_validated, on_rule_evaluated):
+        self.__dict__.update(step.__dict__)
+        self.view = view
+        self.source_name = step.source.__name__
+        self.on_param_validated = on_param_validated
+        self.on_rule_evaluated = on_rule_evaluated
+
+    def validate(self, sources, failures=None):
+        if self.on_param_validated is None:
+            return Step.validate(self, sources, failures)
+        start = perf_counter_ns()
+        value, error = Step.validate(self, sources, failures)
+        self.on_param_validated(ValidationEvent(
+            self.view, self.source_name, self.key, None,
+            perf_counter_ns() - start, error is None
+        ))
+        return value, error
+
+    def _rule_evaluated(self, rule, start, valid):
+        self.on_rule_evaluated(ValidationEvent(
+            self.view, self.source_name, self.key, rule.__class__.__name__,
+            perf_counter_ns() - start, valid
+        ))
+
+    def apply_rules(self, value, failures=None):
+        if self.on_rule_evaluated is None:
+            return Step.apply_rules(self, value, failures)
+        return self._timed_rules(value, failures, convert=False)
+
+    def convert_rules(self, value, failures=None):
+        if self.on_rule_evaluated is None:
+            return Step.convert_rules(self, value, failures)
+        return self._timed_rules(value, failures, convert=True)
+
+    def _timed_rules(self, value, failures, convert):
+        error_message = None
+        for rule in self.rules:
+            start = perf_counter_ns()
+            if convert and isinstance(rule, ConversionRule):
+                try:
+                    value = rule.convert(value)
+                except ValueError:
+                    self._rule_evaluated(rule, start, False)
+                    return self._fail(
+                        failures, rule.__class__.__name__,
+                        self.rule_prefix + rule.invalid_str()
+                    )
+                self._rule_evaluated(rule, start, True)
+                continue
+
+            valid = rule.is_valid(value)
+            self._rule_evaluated(rule, start, valid)
+            if not valid:
+                error_message = self.rule_prefix + rule.invalid_str()
+                if failures is None:
+                    return None, error_message
+                failures.append(
+                    self.failure(rule.__class__.__name__, error_message)
+                )
+        if error_message is not None:
+            return None, error_message
+        return value, None
+
+    def evaluate_async(self, rule, value):
+        if self.on_rule_evaluated is None:
+            return rule.is_valid(value)
+        return self._timed_async(rule, value)
+
+    async def _timed_async(self, rule, value):
+        # 동시에 수행되므로, 다른 Rule의 대기 시간이 포함될 수 있음
+        start = perf_counter_ns()
+        valid = await rule.is_valid(value)
+        self._rule_evaluated(rule, start, valid)
+        return valid
+
+
+def observe_plan(plan, view, on_param_validated=None, on_rule_evaluated=None):
+    """
+    Instrumented copy of the plan.
+    """
+    return tuple(
+        ObservedStep(step, view, on_param_validated, on_rule_evaluated)
+        for step in plan
+    )
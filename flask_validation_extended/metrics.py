@@ -0,0 +1,336 @@
+"""
+Metrics
+# In-process histograms of the validation timing hooks.
+    - ValidationMetrics: aggregates ValidationEvents of the hooks.
+    - prometheus(): Prometheus text exposition format.
+    - statsd_lines(): StatsD counter / gauge lines.
+    - FailureTracker: failure counters and fast rejection of clients.
+
+metrics = ValidationMetrics()
+validator = Validator(**metrics.hooks())
+"""
+import sys
+from time import time
+from zlib import crc32
+from array import array
+from bisect import bisect_left
+from threading import Lock
+from flask import request
+
+# seconds
+DEFAULT_BUCKETS = (
+    0.000001, 0.000005, 0.00001, 0.00005, 0.0001,
+    0.0005, 0.001, 0.005, 0.01, 0.05, 0.1
+)
+
+
+class Histogram:
+    """
+    Histogram of elapsed nanoseconds, counted per bucket.
+    """
+    def __init__(self, bounds_ns):
+        self.bounds_ns = bounds_ns
+        # 마지막 칸은 +Inf
+        self.counts = [0] * (len(bounds_ns) + 1)
+        self.sum_ns = 0
+        self.count = 0
+
+    def observe(self, elapsed_ns):
+        self.counts[bisect_left(self.bounds_ns, elapsed_ns)] += 1
+        self.sum_ns += elapsed_ns
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _labels(pairs):
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+
+
+def _statsd_name(value):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(value))
+
+
+class ValidationMetrics:
+    """
+    Thread-safe aggregator of param and rule timings,
+    keyed by (view, source, field[, rule], valid).
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="flask_validation"):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._bounds_ns = tuple(int(bound * 1e9) for bound in self.buckets)
+        self._params = {}
+        self._rules = {}
+        self._lock = Lock()
+
+    def hooks(self):
+        """
+        Keyword arguments of Validator.
+        """
+        return {
+            "on_param_validated": self.on_param_validated,
+            "on_rule_evaluated": self.on_rule_evaluated,
+        }
+
+    def _observe(self, table, key, elapsed_ns):
+        with self._lock:
+            histogram = table.get(key)
+            if histogram is None:
+                histogram = table[key] = Histogram(self._bounds_ns)
+            histogram.observe(elapsed_ns)
+
+    def on_param_validated(self, event):
+        self._observe(
+            self._params,
+            (event.view, event.source, event.field, event.valid),
+            event.elapsed_ns
+        )
+
+    def on_rule_evaluated(self, event):
+        self._observe(
+            self._rules,
+            (event.view, event.source, event.field, event.rule, event.valid),
+            event.elapsed_ns
+        )
+
+    def reset(self):
+        with self._lock:
+            self._params = {}
+            self._rules = {}
+
+    def _snapshot(self, reset=False):
+        with self._lock:
+            params, rules = self._params, self._rules
+            if reset:
+                self._params, self._rules = {}, {}
+            else:
+                params, rules = dict(params), dict(rules)
+        return params, rules
+
+    def prometheus(self):
+        """
+        Histograms in the Prometheus text exposition format.
+        """
+        params, rules = self._snapshot()
+        lines = []
+        for kind, table, names in (
+            ("param", params, ("view", "source", "field", "valid")),
+            ("rule", rules, ("view", "source", "field", "rule", "valid")),
+        ):
+            metric = f"{self.prefix}_{kind}_duration_seconds"
+            lines.append(
+                f"# HELP {metric} Elapsed time of the validated {kind}."
+            )
+            lines.append(f"# TYPE {metric} histogram")
+            for key, histogram in sorted(table.items(), key=repr):
+                labels = _labels(zip(names, (
+                    *key[:-1], "true" if key[-1] else "false"
+                )))
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(
+                    f"{metric}_sum{{{labels}}} {histogram.sum_ns / 1e9}"
+                )
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def statsd_lines(self, reset=True):
+        """
+        Counters and mean milliseconds since the last flush, as StatsD lines.
+        prefix.param.view.source.field.valid.count:N|c
+        prefix.param.view.source.field.valid.mean:ms|g
+        """
+        params, rules = self._snapshot(reset=reset)
+        lines = []
+        for kind, table in (("param", params), ("rule", rules)):
+            for key, histogram in table.items():
+                name = ".".join((
+                    self.prefix, kind,
+                    *(_statsd_name(part) for part in key[:-1]),
+                    "valid" if key[-1] else "invalid"
+                ))
+                mean_ms = histogram.sum_ns / histogram.count / 1e6
+                lines.append(f"{name}.count:{histogram.count}|c")
+                lines.append(f"{name}.mean:{mean_ms:.6f}|g")
+        return lines
+
+
+class FailureTracker:
+    """
+    Failure counters per view and field, and failure rate per client key.
+    Counters live in a fixed int64 array, in-process or in shared memory
+    (multiprocessing.shared_memory) to aggregate multiple workers.
+
+    FailureTracker(key="X-Api-Key", max_failures=20, window=60)
+    """
+    def __init__(
+            self,
+            key=None,
+            max_failures=None,
+            window=60,
+            resolution=6,
+            slots=4096,
+            max_fields=1024,
+            shared_name=None,
+            reject_message="Too many invalid requests."
+    ):
+        if isinstance(key, str):
+            header_name = key
+            key = lambda: request.headers.get(header_name)
+        self.key_func = key
+        self.max_failures = max_failures
+        self.window = window
+        self.resolution = resolution
+        self.slots = slots
+        self.max_fields = max_fields
+        self.reject_message = reject_message
+        self._bucket_seconds = window / resolution
+
+        # [field counters][rate counters][rate bucket epochs]
+        self._rate_base = max_fields
+        self._epoch_base = max_fields + slots * resolution
+        size = max_fields + 2 * slots * resolution
+        if shared_name is None:
+            self._memory = None
+            self._counts = array('q', [0]) * size
+        else:
+            self._memory = _attach_shared_memory(shared_name, size * 8)
+            self._counts = self._memory.buf.cast('q')
+        self._names = {}
+        self._lock = Lock()
+
+    def register(self, view, plan):
+        """
+        Allocate counters of the view and its fields.
+        Every worker must register the views in the same order.
+        (Counters over max_fields are not kept.)
+        """
+        for field in (None, *(step.key for step in plan)):
+            name = (view, field)
+            if name not in self._names and len(self._names) < self.max_fields:
+                self._names[name] = len(self._names)
+
+    def param_hook(self, next_hook=None):
+        """
+        on_param_validated hook counting the failed fields.
+        """
+        names = self._names
+
+        def on_param_validated(event):
+            if not event.valid:
+                idx = names.get((event.view, event.field))
+                if idx is not None:
+                    self._increment(idx)
+            if next_hook is not None:
+                next_hook(event)
+        return on_param_validated
+
+    def _increment(self, idx):
+        with self._lock:
+            self._counts[idx] += 1
+
+    def client_key(self):
+        if self.key_func is None:
+            return None
+        return self.key_func()
+
+    def _rate_index(self, key):
+        slot = crc32(str(key).encode()) % self.slots
+        return self._rate_base + slot * self.resolution
+
+    def record_failure(self, view, key=None):
+        """
+        Count a failed request of the view (and of the client key).
+        """
+        idx = self._names.get((view, None))
+        if idx is not None:
+            self._increment(idx)
+        if key is None:
+            return
+        epoch = int(time() / self._bucket_seconds)
+        idx = self._rate_index(key) + epoch % self.resolution
+        epoch_idx = idx - self._rate_base + self._epoch_base
+        counts = self._counts
+        with self._lock:
+            # 링 버퍼의 칸이 이전 주기의 것이면 초기화
+            if counts[epoch_idx] != epoch:
+                counts[epoch_idx] = epoch
+                counts[idx] = 0
+            counts[idx] += 1
+
+    def failure_rate(self, key):
+        """
+        Failures of the client key within the window.
+        """
+        epoch = int(time() / self._bucket_seconds)
+        base = self._rate_index(key)
+        epoch_base = base - self._rate_base + self._epoch_base
+        counts = self._counts
+        total = 0
+        for i in range(self.resolution):
+            if counts[epoch_base + i] > epoch - self.resolution:
+                total += counts[base + i]
+        return total
+
+    def is_blocked(self, key):
+        if key is None or self.max_failures is None:
+            return False
+        return self.failure_rate(key) >= self.max_failures
+
+    def failures(self):
+        """
+        {(view, field): failures}, field is None for the view itself.
+        """
+        return {name: self._counts[idx] for name, idx in self._names.items()}
+
+    def prometheus(self, prefix="flask_validation"):
+        metric = f"{prefix}_failures_total"
+        lines = [
+            f"# HELP {metric} Failed validations per view and field.",
+            f"# TYPE {metric} counter",
+        ]
+        for (view, field), count in self.failures().items():
+            labels = _labels((("view", view), ("field", field or "")))
+            lines.append(f"{metric}{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        if self._memory is not None:
+            self._counts.release()
+            self._memory.close()
+
+    def unlink(self):
+        """
+        Remove the shared memory. (call once, from the last process)
+        """
+        if self._memory is not None:
+            if sys.version_info < (3, 13):
+                # SharedMemory.unlink()이 추적 해제를 다시 요청하므로, 먼저 등록
+                from multiprocessing import resource_tracker
+                resource_tracker.register(self._memory._name, "shared_memory")
+            self._memory.unlink()
+
+
+def _attach_shared_memory(name, size):
+    from multiprocessing.shared_memory import SharedMemory
+    # 프로세스의 resource_tracker는 종료 시점에 세그먼트를 unlink하므로,
+    # worker가 재시작되어도 카운터가 유지되도록 추적에서 제외 (unlink()로만 제거)
+    options = {"track": False} if sys.version_info >= (3, 13) else {}
+    try:
+        memory = SharedMemory(name=name, create=True, size=size, **options)
+    except FileExistsError:
+        memory = SharedMemory(name=name, **options)
+    if not options:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
@@ -0,0 +1,201 @@
+"""
+Multipart
+# File rules enforced while the multipart body is parsed.
+    - Ext, ContentType, MaxFileCount: checked when a file part starts.
+    - MaxFileSize: checked as the bytes of the file are written.
+    - MaxTotalFileSize: byte budget of the request, checked as the bytes of
+      every file part (of any param) are written.
+    - MagicBytes: checked once the leading bytes are received.
+    - The parsing is aborted as soon as a rule fails,
+      so the rest of the upload is never spooled.
+"""
+from functools import partial
+from flask import request
+from werkzeug.datastructures import MultiDict
+from werkzeug.formparser import FormDataParser, MultiPartParser
+from .params import File
+from .rules import (
+    Ext, ContentType, MagicBytes, MaxFileCount, MaxFileSize, MaxTotalFileSize
+)
+from .streaming import StreamAbort
+
+STREAMED_FILE_RULES = (
+    Ext, ContentType, MagicBytes, MaxFileCount, MaxFileSize, MaxTotalFileSize
+)
+
+
+class FileLimits:
+    """
+    Precomputed streaming checks of a File step.
+    """
+    def __init__(self, step):
+        self.step = step
+        self.part_rules = tuple(
+            rule for rule in step.rules if isinstance(rule, (Ext, ContentType))
+        )
+        self.max_counts = tuple(
+            rule for rule in step.rules if isinstance(rule, MaxFileCount)
+        )
+        self.max_sizes = tuple(
+            rule for rule in step.rules if isinstance(rule, MaxFileSize)
+        )
+        self.max_totals = tuple(
+            rule for rule in step.rules if isinstance(rule, MaxTotalFileSize)
+        )
+        self.magics = tuple(
+            rule for rule in step.rules if isinstance(rule, MagicBytes)
+        )
+        self.head_size = max(
+            (rule.head_size for rule in self.magics), default=0
+        )
+
+    def abort(self, rule):
+        raise StreamAbort(
+            self.step, rule.__class__.__name__,
+            self.step.rule_prefix + rule.invalid_str()
+        )
+
+    def start(self, count, filename, content_type):
+        for rule in self.max_counts:
+            if count > rule.max_num:
+                self.abort(rule)
+        for rule in self.part_rules:
+            if isinstance(rule, Ext):
+                if not rule.match(filename):
+                    self.abort(rule)
+            elif not rule.match(content_type):
+                self.abort(rule)
+
+    def check_size(self, size):
+        for rule in self.max_sizes:
+            if size > rule.max_bytes:
+                self.abort(rule)
+
+    def check_head(self, head):
+        for rule in self.magics:
+            if not rule.match(head):
+                self.abort(rule)
+
+
+class _GuardedStream:
+    """
+    Spooled file of a part, checked as the parser writes to it.
+    limits is None for a part of a param without File limits,
+    which only counts for the byte budget of the request.
+    """
+    def __init__(self, stream, parser, limits):
+        self._stream = stream
+        self._parser = parser
+        self._limits = limits
+        self._size = 0
+        self._head = b"" if limits is not None and limits.head_size else None
+
+    def write(self, data):
+        self._size += len(data)
+        if self._limits is not None:
+            self._limits.check_size(self._size)
+        self._parser.add_total(len(data))
+        if self._head is not None:
+            self._head += data[:self._limits.head_size]
+            if len(self._head) >= self._limits.head_size:
+                self._limits.check_head(self._head)
+                self._head = None
+        return self._stream.write(data)
+
+    def seek(self, *args):
+        # 파일이 시그니처보다 짧게 끝난 경우
+        if self._head is not None:
+            self._limits.check_head(self._head)
+            self._head = None
+        return self._stream.seek(*args)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class GuardedMultiPartParser(MultiPartParser):
+
+    def __init__(self, limits, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limits = limits
+        self.counts = dict.fromkeys(limits, 0)
+        # MaxTotalFileSize는 요청 전체의 파일 바이트 수로 검사
+        self.budgets = tuple(
+            (file_limits, rule) for file_limits in limits.values()
+            for rule in file_limits.max_totals
+        )
+        self.total = 0
+
+    def add_total(self, size):
+        self.total += size
+        for file_limits, rule in self.budgets:
+            if self.total > rule.max_bytes:
+                file_limits.abort(rule)
+
+    def start_file_streaming(self, event, total_content_length):
+        container = super().start_file_streaming(event, total_content_length)
+        limits = self.limits.get(event.name)
+        # 선택되지 않은 파일 입력은 빈 파일명으로 전송됨
+        if not event.filename or (limits is None and not self.budgets):
+            return container
+        if limits is not None:
+            self.counts[event.name] += 1
+            limits.start(
+                self.counts[event.name], event.filename,
+                event.headers.get("content-type")
+            )
+        return _GuardedStream(container, self, limits)
+
+
+class GuardedFormDataParser(FormDataParser):
+
+    def __init__(self, *args, limits, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limits = limits
+
+    def _parse_multipart(self, stream, mimetype, content_length, options):
+        parser = GuardedMultiPartParser(
+            self.limits,
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            max_form_parts=self.max_form_parts,
+            cls=self.cls,
+        )
+        boundary = options.get("boundary", "").encode("ascii")
+
+        if not boundary:
+            raise ValueError("Missing boundary")
+
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
+
+
+def make_multipart_loader(plan, loader):
+    """
+    Form / File source loader parsing the body with the File limits of the plan.
+    Returns the loader as is, if no File rule can be checked while parsing.
+    """
+    limits = {
+        step.key: FileLimits(step) for step in plan
+        if step.source is File and any(
+            isinstance(rule, STREAMED_FILE_RULES) for rule in step.rules
+        )
+    }
+    if not limits:
+        return loader
+    parser_class = partial(GuardedFormDataParser, limits=limits)
+
+    def load_multipart(kwargs):
+        if "form" not in request.__dict__:
+            request.form_data_parser_class = parser_class
+        try:
+            return loader(kwargs)
+        except StreamAbort:
+            # 파싱을 중단한 경우, 남은 본문은 읽지 않고 빈 폼으로 처리
+            request.__dict__.setdefault("form", MultiDict())
+            request.__dict__.setdefault("files", MultiDict())
+            raise
+    return load_multipart
@@ -0,0 +1,80 @@
+"""
+Parallel
+# Sharded validation of large lists on a concurrent.futures executor.
+    - Json List(...) params and Batch records above the threshold
+      are split into chunks, validated by the executor and merged in order.
+    - With ProcessPoolExecutor, the annotation and rules are pickled
+      to the workers, and their checkers are compiled again there.
+    - The workers return their validated chunks (with defaults filled),
+      so the view receives the same value as without the executor.
+    - Lists of at most threshold items are validated in place, as usual.
+"""
+from itertools import repeat
+from .types import List, compile_type_check, compile_fill_defaults
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def chunked(data, size):
+    """
+    [(start index, chunk), ...] of the list, in order.
+    """
+    return [
+        (start, data[start:start + size])
+        for start in range(0, len(data), size)
+    ]
+
+
+def check_chunk(annotation, item_rules, chunk):
+    """
+    Type check (and item rules) of a chunk, in the worker.
+    Returns the chunk with defaults filled, or None if it is invalid.
+    """
+    if not compile_type_check(annotation, item_rules)(chunk):
+        return None
+    fill = compile_fill_defaults(annotation)
+    if fill is not None:
+        fill(chunk)
+    return chunk
+
+
+class ShardedCheck:
+    """
+    Type check and item rules of a List(...) step, sharded over the executor.
+    Returns (value, failed check, error_message).
+    """
+    def __init__(self, step, executor, threshold):
+        self.step = step
+        self.executor = executor
+        self.threshold = threshold
+
+    def __call__(self, data):
+        step = self.step
+        if not isinstance(data, list) or len(data) <= self.threshold:
+            if not step.checker(data):
+                return (None,) + step.check_failure(data)
+            if step.fill is not None:
+                step.fill(data)
+            return data, None, None
+
+        chunks = [chunk for _, chunk in chunked(data, self.threshold)]
+        value = []
+        for chunk in self.executor.map(
+            check_chunk,
+            repeat(step.annotation[0]), repeat(step.item_rules), chunks
+        ):
+            if chunk is None:
+                # 실패한 경우에만, 사유를 찾기 위해 다시 순회
+                return (None,) + step.check_failure(data)
+            # ProcessPoolExecutor에서는 복사본이 검증되므로, 결과를 다시 조립
+            value.extend(chunk)
+        return value, None, None
+
+
+def shard_step(step, executor, threshold):
+    """
+    Sharded check of the step, or None if it isn't a List(...) step.
+    """
+    if len(step.annotation) != 1 or type(step.annotation[0]) is not List:
+        return None
+    return ShardedCheck(step, executor, threshold or DEFAULT_CHUNK_SIZE)
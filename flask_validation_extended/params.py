@@ -1,38 +1,49 @@
 from .types import (
-    All, List, Dict, FileObj, type_check,
+    All, List, Dict, Object, Batch, FileObj, type_check, compile_type_check,
     SINGLE_TYPES, BUILTIN_TYPES
 )
 
-from .rules import ValidationRule
+from .rules import (
+    ValidationRule, ConversionRule, Cached, Each, validate_rules
+)
 from .exceptions import (
-    InvalidOptional, InvalidDefault,
+    InvalidOptional, InvalidConvert, InvalidDefault,
     InvalidAnnotation, InvalidRule,
     InvalidAnnotationJson , InvalidRuleAnnotation,
-    InvalidHeaderName
+    InvalidHeaderName, InvalidListStyle, InvalidConvertRule
 )
 
-CUSTOM_TYPES = {List, Dict, FileObj}
+CUSTOM_TYPES = {List, Dict, Object, Batch, FileObj}
+LIST_STYLES = ("repeat", "comma", "brackets")
 
 
 class Parameter:
 
+    __slots__ = (
+        "annotation", "type_checker", "default", "convert", "rules", "optional"
+    )
+
     def __init__(
             self,
             annotation=All,
             default=None,
             rules=None,
-            optional=False
+            optional=False,
+            convert=False
     ):
         if not isinstance(annotation, (list, tuple)):
             annotation = [annotation]
         self.annotation = self._annotation_valid(annotation)
+        self.type_checker = compile_type_check(self.annotation)
 
         self.default = self._default_valid(default)
+        self.convert = self._convert_valid(convert)
 
         rules = [] if rules is None else rules
         if not isinstance(rules, (tuple, list)):
             rules = [rules]
         self.rules = self._rules_valid(rules)
+        self._default_items_valid()
 
         self.optional = self._optional_valid(optional)
 
@@ -50,32 +61,45 @@ class Parameter:
                 return default
         raise InvalidDefault()
 
-    def _rules_valid(self, rules):
-
-        if isinstance(self.annotation, tuple):
-            origin_anns = list(self.annotation)
-        else:
-            origin_anns = self.annotation[:]
-
-        for idx, origin_ann in enumerate(origin_anns):
-            if hasattr(origin_ann, 'org_type'):
-                origin_anns[idx] = origin_ann.org_type
-
-        for origin_ann in origin_anns:
-            for rule in rules:
-                if rule.__class__.__bases__[0] is not ValidationRule:
-                    raise InvalidRule(rule.__class__.__bases__[0])
-                if isinstance(rule.types, (list, tuple)):
-                    if All not in rule.types and origin_ann not in rule.types:
-                        raise InvalidRuleAnnotation(
-                            rule.__class__.__name__, rule.types
-                        )
-                else:
-                    if rule.types is not All and  origin_ann is not rule.types:
-                        raise InvalidRuleAnnotation(
-                            rule.__class__.__name__, rule.types
-                        )
+    def _default_items_valid(self):
+        """
+        The default skips the type check at request time,
+        so the item rules of Each are checked here.
+        """
+        if self.default is None:
+            return
+        item_rules = tuple(
+            item_rule for rule in self.rules if isinstance(rule, Each)
+            for item_rule in rule.rules
+        )
+        if item_rules and not compile_type_check(
+            self.annotation, item_rules
+        )(self.default):
+            raise InvalidDefault()
 
+    def _rules_valid(self, rules):
+        if not self.convert:
+            return validate_rules(self.annotation, rules)
+        # Cached는 검증 결과만 저장하므로, 변환된 값을 전달할 수 없음
+        for rule in rules:
+            if isinstance(rule, Cached) and isinstance(rule.rule, ConversionRule):
+                raise InvalidConvertRule(rule.rule.__class__.__name__)
+        # 변환 Rule 이후의 Rule은 변환된 값의 타입(output_type)으로 검증
+        annotation, start = self.annotation, 0
+        for idx, rule in enumerate(rules):
+            if not isinstance(rule, ConversionRule):
+                continue
+            validate_rules(annotation, rules[start:idx + 1])
+            annotation, start = rule.output_type, idx + 1
+            if annotation is All:
+                # 변환된 값의 타입을 알 수 없는 경우, Rule 여부만 검증
+                for next_rule in rules[start:]:
+                    if not isinstance(next_rule, ValidationRule):
+                        raise InvalidRule(next_rule.__class__.__bases__[0])
+                return rules
+            if not isinstance(annotation, (list, tuple)):
+                annotation = [annotation]
+        validate_rules(annotation, rules[start:])
         return rules
 
     @staticmethod
@@ -84,20 +108,61 @@ class Parameter:
             return optional
         raise InvalidOptional()
 
+    @staticmethod
+    def _convert_valid(convert):
+        if isinstance(convert, bool):
+            return convert
+        raise InvalidConvert()
+
 
 class Route(Parameter):
-    pass
+    __slots__ = ()
+
+
+class MultiValueParameter(Parameter):
+    """
+    Parameter which can be given several times. (List(int), List(str), ...)
+    style: how the list is given
+        - "repeat": ?id=1&id=2
+        - "comma": ?id=1,2
+        - "brackets": ?id[]=1&id[]=2
+    """
+    __slots__ = ("style",)
+
+    def __init__(self, *args, style="repeat", **kwargs):
+        if style not in LIST_STYLES:
+            raise InvalidListStyle(style)
+        self.style = style
+        super().__init__(*args, **kwargs)
+
+    def _annotation_valid(self, annotations):
+        lists = [
+            annotation for annotation in annotations
+            if type(annotation) is List
+        ]
+        if not lists:
+            return super()._annotation_valid(annotations)
+        # List는 단일 어노테이션으로만, 원소는 단일 타입으로만 허용
+        item = lists[0].item
+        if len(annotations) > 1 or not (
+            item is All or (isinstance(item, type) and item in SINGLE_TYPES)
+        ):
+            raise InvalidAnnotation(self.__class__.__name__)
+        return annotations
 
 
-class Query(Parameter):
-    pass
+class Query(MultiValueParameter):
+    __slots__ = ()
 
 
-class Form(Parameter):
-    pass
+class Form(MultiValueParameter):
+    __slots__ = ()
 
 
 class Header(Parameter):
+
+    __slots__ = ("header_name",)
+
     def __init__(self, header_name, *args, **kwargs):
         if not isinstance(header_name, str):
             raise InvalidHeaderName()
@@ -107,6 +172,8 @@ class Header(Parameter):
 
 class Json(Parameter):
 
+    __slots__ = ()
+
     def _annotation_valid(self, annotations):
         for annotation in annotations:
             if (
@@ -115,10 +182,17 @@ class Json(Parameter):
                 annotation is not All
             ):
                 raise InvalidAnnotationJson(self.__class__.__name__)
+        # Batch는 다른 어노테이션과 함께 사용할 수 없음
+        if len(annotations) > 1 and any(
+            isinstance(annotation, Batch) for annotation in annotations
+        ):
+            raise InvalidAnnotationJson(self.__class__.__name__)
         return annotations
 
 class File(Parameter):
 
+    __slots__ = ()
+
     def __init__(self, rules=None, optional=False):
         super().__init__(rules=rules, optional=optional)
         self.annotation = [FileObj]
@@ -129,7 +203,7 @@ class File(Parameter):
     def _rules_valid(self, rules):
 
         for rule in rules:
-            if rule.__class__.__bases__[0] is not ValidationRule:
+            if not isinstance(rule, ValidationRule):
                 raise InvalidRule(rule.__class__.__bases__[0])
             if isinstance(rule.types, (list, tuple)):
                 if All not in rule.types and FileObj not in rule.types:
@@ -0,0 +1,518 @@
+"""
+Plans
+# A view's validation plan is compiled once, when the decorator is applied.
+    - Plan: ordered tuple of Steps, one per view argument.
+    - Step: precomputed source, lookup key (environ key of Header), converter,
+            type checker, rules and error messages of a Param.
+"""
+from .params import Route, Query, Form, Header, Json, File
+from .types import (
+    All, List, Batch, FileObj, compile_type_check, compile_fill_defaults
+)
+from .rules import AsyncValidationRule, ConversionRule, Each
+from .vectorize import vectorize_step, array_output
+from .batch import BatchTransform
+from .parallel import shard_step
+from .exceptions import InvalidParameter
+
+SOURCES = {Route, Query, Form, Header, Json, File}
+CONVERTIBLE_SOURCES = {Header, Query, Form, Route}
+MULTI_VALUE_SOURCES = {Query, Form}
+
+
+def _convert_int(data):
+    try:
+        return int(data), True
+    except ValueError:
+        return data, False
+
+
+def _convert_float(data):
+    try:
+        return float(data), True
+    except ValueError:
+        return data, False
+
+
+def _convert_bool(data):
+    lowered = data.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true', True
+    return data, False
+
+
+def _convert_never(data):
+    return data, False
+
+
+CONVERTERS = {
+    int: _convert_int,
+    float: _convert_float,
+    bool: _convert_bool,
+}
+
+
+def _convert_int_list(values):
+    try:
+        return list(map(int, values)), True
+    except ValueError:
+        return values, False
+
+
+def _convert_float_list(values):
+    try:
+        return list(map(float, values)), True
+    except ValueError:
+        return values, False
+
+
+def _convert_bool_list(values):
+    converted = []
+    for value in values:
+        lowered = value.lower()
+        if lowered == 'true':
+            converted.append(True)
+        elif lowered == 'false':
+            converted.append(False)
+        else:
+            return values, False
+    return converted, True
+
+
+# Query, Form의 List 어노테이션은 모든 값을 한번에 변환
+LIST_CONVERTERS = {
+    int: _convert_int_list,
+    float: _convert_float_list,
+    bool: _convert_bool_list,
+}
+
+
+# CGI 규격상 HTTP_ 접두어 없이 environ에 저장되는 헤더
+ENVIRON_HEADERS = {"CONTENT_TYPE", "CONTENT_LENGTH"}
+
+
+def environ_key(header_name):
+    """
+    WSGI environ key of the header. (X-Api-Key -> HTTP_X_API_KEY)
+    """
+    key = header_name.upper().replace("-", "_")
+    if key in ENVIRON_HEADERS:
+        return key
+    return "HTTP_" + key
+
+
+def _fetch_value(source, key):
+    return source.get(key)
+
+
+def _fetch_list(source, key):
+    values = source.getlist(key)
+    if not values:
+        return None
+    return values
+
+
+def _fetch_comma_list(source, key):
+    value = source.get(key)
+    if value is None:
+        return None
+    if not value:
+        return []
+    return value.split(",")
+
+
+def _fetch_files(source, key):
+    files = source.getlist(key)
+    if not files:
+        return None
+    if len(files) == 1 and files[0].filename == "":
+        return None
+    return files
+
+
+class Step:
+    """
+    Precomputed validation of a single view argument.
+    """
+    def __init__(self, name, param):
+        source = param.__class__
+        annotation = param.annotation
+        source_name = source.__name__
+
+        self.name = name
+        self.source = source
+        self.key = param.header_name if source is Header else name
+        # Header는 요청마다 헤더 객체를 거치지 않고, environ에서 바로 조회
+        self.lookup_key = environ_key(self.key) if source is Header else name
+        self.fetch = _fetch_files if source is File else _fetch_value
+        multi_value = (
+            source in MULTI_VALUE_SOURCES and type(annotation[0]) is List
+        )
+        if multi_value:
+            if param.style == "comma":
+                self.fetch = _fetch_comma_list
+            else:
+                self.fetch = _fetch_list
+            if param.style == "brackets":
+                self.lookup_key = name + "[]"
+        self.annotation = annotation
+        self.default = param.default
+        self.required = not param.optional
+        self.rules = tuple(
+            rule for rule in param.rules
+            if not isinstance(rule, (AsyncValidationRule, Each))
+        )
+        self.async_rules = tuple(
+            rule for rule in param.rules
+            if isinstance(rule, AsyncValidationRule)
+        )
+        # Each의 Rule은 타입 검사와 같은 순회에서 원소별로 검증
+        self.item_rules = tuple(
+            item_rule for rule in param.rules if isinstance(rule, Each)
+            for item_rule in rule.rules
+        )
+        # convert=True인 경우, 변환 Rule이 파싱한 값을 다음 Rule과 view에 전달
+        self.convert = param.convert and any(
+            isinstance(rule, ConversionRule) for rule in self.rules
+        )
+
+        # Query, Header, Form, Route의 경우, 첫번째 어노테이션 기준으로 타입 변환
+        self.convert_type = list if multi_value else str
+        if multi_value:
+            self.converter = LIST_CONVERTERS.get(annotation[0].item)
+        elif source in CONVERTIBLE_SOURCES and annotation[0] not in (str, All):
+            self.converter = CONVERTERS.get(annotation[0], _convert_never)
+        else:
+            self.converter = None
+
+        self.type_checker = param.type_checker
+        if annotation[0] is FileObj:
+            self.checker = None
+        elif self.item_rules:
+            self.checker = compile_type_check(annotation, self.item_rules)
+        else:
+            self.checker = param.type_checker
+        # 검사를 통과한 값에 Object 필드의 default를 채우는 callable
+        self.fill = compile_fill_defaults(annotation)
+
+        if source is Header:
+            self.missing_message = (
+                f"Required [{source_name}] parameter, "
+                f"Header '{param.header_name}' not given."
+            )
+        else:
+            self.missing_message = (
+                f"Required [{source_name}] parameter, "
+                f"'{name}' not given."
+            )
+        self.convert_message = (
+            f"In [{source_name}] Params, "
+            f"'{name}' can't be converted to {annotation[0]}."
+        )
+        self.type_message = (
+            f"In [{source_name}] Params, "
+            f"'{name}' is not {[str(i) for i in annotation]}."
+        )
+        self.rule_prefix = f'Parameter <{name}>: '
+        # 타입 검사를 대체하여 값을 변환하는 callable, (value, check, message) 반환
+        # (NumPy 배열 변환, Batch 레코드 검증)
+        self.transform = None
+        if len(annotation) == 1 and isinstance(annotation[0], Batch):
+            self.transform = BatchTransform(self, annotation[0])
+        # 모든 Rule을 통과한 값을 view에 전달할 값으로 변환하는 callable
+        # (NumPy 배열 변환, 비동기 Rule이 있는 경우 비동기 Rule 이후에 적용)
+        self.output = None
+        # Object처럼 상세 사유를 설명할 수 있는 어노테이션인 경우
+        if len(annotation) == 1 and hasattr(annotation[0], 'explain'):
+            self.explain = annotation[0].explain
+        else:
+            self.explain = None
+
+    def validate(self, sources, failures=None):
+        """
+        Returns (value, error_message) for this argument.
+        If failures list is given, every rule is evaluated
+        and each failure is appended to it.
+        """
+        user_input = self.fetch(sources[self.source], self.lookup_key)
+
+        if user_input is None:
+            # 사용자의 정보가 입력되지 않았으나, default가 명시된 경우, 할당
+            # (default는 Param 생성 시점에 이미 타입 검증됨)
+            if self.default is not None:
+                user_input = self.default
+            # 사용자의 인풋 및 default가 모두 없으며, optional이 아닌 경우, 에러 반환
+            elif self.required:
+                return self._fail(failures, "required", self.missing_message)
+            else:
+                return None, None
+        else:
+            # 지정된 타입으로의 convert 실패시, 에러 반환
+            if (
+                self.converter is not None and
+                isinstance(user_input, self.convert_type)
+            ):
+                user_input, status = self.converter(user_input)
+                if not status:
+                    return self._fail(
+                        failures, "convert", self.convert_message
+                    )
+
+            if self.transform is not None:
+                user_input, check, message = self.transform(user_input)
+                if check is not None:
+                    return self._fail(failures, check, message)
+            elif self.checker is not None:
+                if not self.checker(user_input):
+                    check, message = self.check_failure(user_input)
+                    return self._fail(failures, check, message)
+                if self.fill is not None:
+                    self.fill(user_input)
+
+        if self.convert:
+            value, error = self.convert_rules(user_input, failures)
+        else:
+            value, error = self.apply_rules(user_input, failures)
+        if self.output is not None and error is None and not self.async_rules:
+            value = self.output(value)
+        return value, error
+
+    def apply_rules(self, value, failures=None):
+        """
+        Returns (value, error_message) of the sync rules.
+        """
+        error_message = None
+        for rule in self.rules:
+            if not rule.is_valid(value):
+                error_message = self.rule_prefix + rule.invalid_str()
+                if failures is None:
+                    return None, error_message
+                failures.append(
+                    self.failure(rule.__class__.__name__, error_message)
+                )
+        if error_message is not None:
+            return None, error_message
+        return value, None
+
+    def convert_rules(self, value, failures=None):
+        """
+        Rules of convert=True Param. Returns (parsed_value, error_message).
+        Conversion failure stops the rules, as the next ones need its value.
+        """
+        error_message = None
+        for rule in self.rules:
+            if isinstance(rule, ConversionRule):
+                try:
+                    value = rule.convert(value)
+                    continue
+                except ValueError:
+                    return self._fail(
+                        failures, rule.__class__.__name__,
+                        self.rule_prefix + rule.invalid_str()
+                    )
+            if not rule.is_valid(value):
+                error_message = self.rule_prefix + rule.invalid_str()
+                if failures is None:
+                    return None, error_message
+                failures.append(
+                    self.failure(rule.__class__.__name__, error_message)
+                )
+        if error_message is not None:
+            return None, error_message
+        return value, None
+
+    def evaluate_async(self, rule, value):
+        """
+        Returns the awaitable result of the async rule.
+        """
+        return rule.is_valid(value)
+
+    def check_failure(self, value):
+        """
+        Returns (check, error_message) of the value failed the checker.
+        """
+        if self.item_rules and self.type_checker(value):
+            items = value.items() if isinstance(value, dict) else enumerate(value)
+            for key, item in items:
+                for rule in self.item_rules:
+                    if not rule.is_valid(item):
+                        return rule.__class__.__name__, (
+                            f"{self.rule_prefix}item [{key!r}] "
+                            f"{rule.invalid_str()}"
+                        )
+        return "type", self.type_error(value)
+
+    def type_error(self, value):
+        if self.explain is None:
+            return self.type_message
+        detail = self.explain(value)
+        if detail is None:
+            return self.type_message
+        return f"{self.type_message} ({detail})"
+
+    def failure(self, check, message):
+        """
+        Structured failure of this argument.
+        """
+        return {
+            "source": self.source.__name__,
+            "field": self.key,
+            "check": check,
+            "message": message,
+        }
+
+    def _fail(self, failures, check, message):
+        if failures is not None:
+            failures.append(self.failure(check, message))
+        return None, message
+
+
+def compile_steps(
+        params,
+        numpy_threshold=None,
+        numpy_output=False,
+        executor=None,
+        executor_threshold=None
+):
+    """
+    Compile (name, Param) pairs into an immutable plan.
+    """
+    steps = []
+    for name, param in params:
+        step = Step(name, param)
+        if numpy_threshold is not None and step.source is Json:
+            if step.transform is None:
+                step.transform = vectorize_step(step, numpy_threshold)
+            if numpy_output:
+                step.output = array_output(step, numpy_threshold)
+        if executor is not None and step.source is Json:
+            # 큰 List, Batch는 executor에서 나누어 검증
+            if isinstance(step.transform, BatchTransform):
+                step.transform = BatchTransform(
+                    step, step.transform.batch, executor, executor_threshold
+                )
+            elif step.transform is None:
+                step.transform = shard_step(
+                    step, executor, executor_threshold
+                )
+        steps.append(step)
+    return tuple(steps)
+
+
+def compile_plan(f, **options):
+    """
+    Compile the signature of view function into an immutable plan.
+    """
+    # inspect는 import 비용이 크므로, 데코레이터 적용 시점에 import
+    from inspect import signature
+    params = []
+    for arg in signature(f).parameters.values():
+        if arg.default.__class__ not in SOURCES:
+            raise InvalidParameter(f.__name__, arg.name)
+        params.append((arg.name, arg.default))
+    return compile_steps(params, **options)
+
+
+def execute(plan, sources):
+    """
+    Walk the plan over request sources.
+    Returns (parsed_inputs, error_message).
+    """
+    parsed_inputs = {}
+    for step in plan:
+        value, error = step.validate(sources)
+        if error is not None:
+            return None, error
+        parsed_inputs[step.name] = value
+    return parsed_inputs, None
+
+
+def sources_of(plan):
+    """
+    Sources referenced by the plan, in order of first use.
+    """
+    sources = []
+    for step in plan:
+        if step.source not in sources:
+            sources.append(step.source)
+    return tuple(sources)
+
+
+def execute_all(plan, sources, max_errors=None):
+    """
+    Walk the whole plan over request sources, collecting every failure.
+    Returns (parsed_inputs, failures). parsed_inputs has passed arguments only.
+    """
+    parsed_inputs = {}
+    failures = []
+    for step in plan:
+        value, error = step.validate(sources, failures)
+        if max_errors is not None and len(failures) >= max_errors:
+            return parsed_inputs, failures[:max_errors]
+        if error is None:
+            parsed_inputs[step.name] = value
+    return parsed_inputs, failures
+
+
+def _schedule_async_rules(async_steps, parsed_inputs):
+    pending = []
+    for step in async_steps:
+        value = parsed_inputs.get(step.name)
+        if value is None:
+            continue
+        for rule in step.async_rules:
+            pending.append((step, rule, step.evaluate_async(rule, value)))
+    return pending
+
+
+def _apply_async_outputs(async_steps, parsed_inputs):
+    """
+    Output conversion of the async steps, after their async rules passed.
+    """
+    for step in async_steps:
+        value = parsed_inputs.get(step.name)
+        if step.output is not None and value is not None:
+            parsed_inputs[step.name] = step.output(value)
+
+
+async def execute_async(async_steps, parsed_inputs, error=None):
+    """
+    Evaluate async rules of all arguments concurrently,
+    after every sync check has passed. Returns error_message.
+    """
+    if error is not None:
+        return error
+    # 비동기 Rule이 있는 경우에만 asyncio를 import
+    import asyncio
+    pending = _schedule_async_rules(async_steps, parsed_inputs)
+    results = await asyncio.gather(*(coro for _, _, coro in pending))
+    for (step, rule, _), valid in zip(pending, results):
+        if not valid:
+            return step.rule_prefix + rule.invalid_str()
+    _apply_async_outputs(async_steps, parsed_inputs)
+    return None
+
+
+async def execute_async_all(
+        async_steps, parsed_inputs, failures, max_errors=None
+):
+    """
+    Evaluate async rules of all arguments concurrently,
+    collecting every failure. Returns failures.
+    """
+    if max_errors is not None and len(failures) >= max_errors:
+        return failures
+    import asyncio
+    pending = _schedule_async_rules(async_steps, parsed_inputs)
+    results = await asyncio.gather(*(coro for _, _, coro in pending))
+    for (step, rule, _), valid in zip(pending, results):
+        if not valid:
+            failures.append(step.failure(
+                rule.__class__.__name__,
+                step.rule_prefix + rule.invalid_str()
+            ))
+    if not failures:
+        _apply_async_outputs(async_steps, parsed_inputs)
+    if max_errors is not None:
+        return failures[:max_errors]
+    return failures
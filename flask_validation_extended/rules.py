@@ -1,22 +1,27 @@
-import re
+from math import isfinite
 from datetime import datetime
+from functools import lru_cache
 from abc import ABCMeta, abstractmethod
-from .exceptions import InvalidRuleParameter
-from .types import All, FileObj
+from .exceptions import (
+    InvalidRuleParameter, InvalidRule, InvalidRuleAnnotation
+)
+from .types import All, FileObj, List, Dict
+
+# re, uuid, ipaddress, decimal은 모듈 import 시점이 아닌,
+# 해당 Rule을 생성하는 시점에 import (패키지 import 비용 감소)
 
 
 class ValidationRule(metaclass=ABCMeta):
 
+    __slots__ = ()
+    types = All
+
     @staticmethod
     def _param_validate(param, param_type):
         if not isinstance(param, param_type):
             raise InvalidRuleParameter(param, param_type)
         return param
 
-    @property
-    def types(self):
-        return All
-
     def invalid_str(self):
         return f"doesn't not match the {self.__class__.__name__} rule"
 
@@ -24,15 +29,159 @@ class ValidationRule(metaclass=ABCMeta):
     def is_valid(self, data) -> bool:
         pass
 
+    def cached(self, maxsize=1024):
+        return Cached(self, maxsize)
+
+
+def validate_rules(annotations, rules):
+    """
+    Check whether all annotations can apply each rule.
+    """
+    if isinstance(annotations, tuple):
+        origin_anns = list(annotations)
+    else:
+        origin_anns = annotations[:]
+
+    for idx, origin_ann in enumerate(origin_anns):
+        if hasattr(origin_ann, 'org_type'):
+            origin_anns[idx] = origin_ann.org_type
+
+    for origin_ann in origin_anns:
+        for rule in rules:
+            if not isinstance(rule, ValidationRule):
+                raise InvalidRule(rule.__class__.__bases__[0])
+            if isinstance(rule.types, (list, tuple)):
+                if All not in rule.types and origin_ann not in rule.types:
+                    raise InvalidRuleAnnotation(
+                        rule.__class__.__name__, rule.types
+                    )
+            else:
+                if rule.types is not All and  origin_ann is not rule.types:
+                    raise InvalidRuleAnnotation(
+                        rule.__class__.__name__, rule.types
+                    )
+
+    # Each의 경우, 내부 Rule을 List, Dict의 원소 어노테이션에 대하여 검증
+    for rule in rules:
+        if isinstance(rule, Each):
+            for annotation in annotations:
+                # Object의 필드 값은 Field의 rules로, Batch의 레코드는 schema로 검증
+                if hasattr(annotation, 'org_type') and not isinstance(
+                    annotation, (List, Dict)
+                ):
+                    raise InvalidRuleAnnotation(
+                        rule.__class__.__name__, ("List", "Dict")
+                    )
+                item = getattr(annotation, 'item', All)
+                if not isinstance(item, (list, tuple)):
+                    item = [item]
+                validate_rules(item, rule.rules)
+
+    return rules
+
+
+class AsyncValidationRule(ValidationRule):
+    """
+    Rule whose is_valid is awaitable. (only for async views)
+    """
+    __slots__ = ()
 
-class MinLen(ValidationRule):
+    @abstractmethod
+    async def is_valid(self, data) -> bool:
+        pass
 
-    def __init__(self, num):
-        self._num = self._param_validate(num, int)
+
+class Each(ValidationRule):
+    """
+    Apply rules to every item of List, Dict.
+    In a Param, the rules are evaluated in the same pass as the type check.
+    """
+    __slots__ = ("rules",)
+    types = (list, dict)
+
+    def __init__(self, *rules):
+        if len(rules) == 1 and isinstance(rules[0], (list, tuple)):
+            rules = rules[0]
+        for rule in rules:
+            if (
+                not isinstance(rule, ValidationRule) or
+                isinstance(rule, (Each, AsyncValidationRule))
+            ):
+                raise InvalidRule(rule.__class__.__name__)
+        self.rules = tuple(rules)
+
+    def invalid_str(self):
+        return "each item " + " ".join(
+            rule.invalid_str() for rule in self.rules
+        )
+
+    def is_valid(self, data) -> bool:
+        values = data.values() if isinstance(data, dict) else data
+        for value in values:
+            for rule in self.rules:
+                if not rule.is_valid(value):
+                    return False
+        return True
+
+
+class Cached(ValidationRule):
+    """
+    Memoize results of the rule in a bounded, thread-safe LRU cache.
+    Only for pure rules. Unhashable data is validated without the cache.
+    """
+    __slots__ = ("rule", "_maxsize", "_is_valid")
+
+    def __init__(self, rule, maxsize=1024):
+        if (
+            not isinstance(rule, ValidationRule) or
+            isinstance(rule, AsyncValidationRule)
+        ):
+            raise InvalidRule(rule.__class__.__name__)
+        self.rule = rule
+        self._maxsize = self._param_validate(maxsize, int)
+        self._is_valid = lru_cache(maxsize=maxsize, typed=True)(rule.is_valid)
 
     @property
     def types(self):
-        return (str, list, dict)
+        return self.rule.types
+
+    def invalid_str(self):
+        return self.rule.invalid_str()
+
+    def is_valid(self, data) -> bool:
+        try:
+            return self._is_valid(data)
+        except TypeError:
+            return self.rule.is_valid(data)
+
+    def cache_info(self):
+        """
+        (hits, misses, maxsize, currsize)
+        """
+        return self._is_valid.cache_info()
+
+    def cache_clear(self):
+        self._is_valid.cache_clear()
+
+    def __getstate__(self):
+        # lru_cache로 감싼 bound method는 pickle할 수 없으므로, 빈 캐시로 다시 생성
+        return {"rule": self.rule, "_maxsize": self._maxsize}
+
+    def __setstate__(self, state):
+        self.rule = state["rule"]
+        self._maxsize = state["_maxsize"]
+        self._is_valid = lru_cache(maxsize=self._maxsize, typed=True)(
+            self.rule.is_valid
+        )
+
+
+class MinLen(ValidationRule):
+
+    __slots__ = ("_num",)
+    types = (str, list, dict)
+
+    def __init__(self, num):
+        self._num = self._param_validate(num, int)
 
     def invalid_str(self):
         return f"must be at least {self._num} elements."
@@ -43,13 +192,12 @@ class MinLen(ValidationRule):
 
 class MaxLen(ValidationRule):
 
+    __slots__ = ("_num",)
+    types = (str, list, dict)
+
     def __init__(self, num):
         self._num = self._param_validate(num, int)
 
-    @property
-    def types(self):
-        return (str, list, dict)
-
     def invalid_str(self):
         return f"must be a maximum of {self._num} elements."
 
@@ -59,45 +207,64 @@ class MaxLen(ValidationRule):
 
 class Min(ValidationRule):
 
+    __slots__ = ("_num",)
+    types = (int, float)
+
     def __init__(self, num):
         self._num = self._param_validate(num, (int, float))
 
-    @property
-    def types(self):
-        return (int, float)
-
     def invalid_str(self):
         return f"must be larger than {self._num}."
 
     def is_valid(self, data) -> bool:
         return self._num <= data
 
+    def is_valid_array(self, array) -> bool:
+        return bool((self._num <= array).all())
+
 
 class Max(ValidationRule):
 
+    __slots__ = ("_num",)
+    types = (int, float)
+
     def __init__(self, num):
         self._num = self._param_validate(num, (int, float))
 
-    @property
-    def types(self):
-        return (int, float)
-
     def invalid_str(self):
         return f"must be smaller than {self._num}."
 
     def is_valid(self, data) -> bool:
         return data <= self._num
 
+    def is_valid_array(self, array) -> bool:
+        return bool((array <= self._num).all())
+
+
+class Finite(ValidationRule):
+
+    __slots__ = ()
+    types = (int, float)
+
+    def invalid_str(self):
+        return "must be a finite number."
+
+    def is_valid(self, data) -> bool:
+        return isfinite(data)
+
+    def is_valid_array(self, array) -> bool:
+        import numpy
+        return bool(numpy.isfinite(array).all())
+
 
 class In(ValidationRule):
 
+    __slots__ = ("_enum",)
+    types = All
+
     def __init__(self, enum):
         self._enum = self._param_validate(enum, (list, tuple))
 
-    @property
-    def types(self):
-        return All
-
     def invalid_str(self):
         return f"must be one of these lists: {self._enum}."
 
@@ -107,9 +274,8 @@ class In(ValidationRule):
 
 class Number(ValidationRule):
 
-    @property
-    def types(self):
-        return str
+    __slots__ = ()
+    types = str
 
     def invalid_str(self):
         return f"must be a digitable(can convert int) string."
@@ -120,9 +286,8 @@ class Number(ValidationRule):
 
 class Strip(ValidationRule):
 
-    @property
-    def types(self):
-        return str
+    __slots__ = ()
+    types = str
 
     def invalid_str(self):
         return f"must be a striped string."
@@ -131,41 +296,174 @@ class Strip(ValidationRule):
         return data == data.strip()
 
 
-class IsoDatetime(ValidationRule):
-
-    @property
-    def types(self):
-        return str
+class ConversionRule(ValidationRule):
+    """
+    Rule which parses the data while validating it.
+    In a Param with convert=True, the parsed value is passed
+    to the next rules and the view instead of the raw data.
+    output_type: type of the parsed value, the next rules are checked
+                 against it. (All: not checked)
+    """
+    __slots__ = ()
+    output_type = All
 
-    def invalid_str(self):
-        return f"must be a ISO Datetime Format."
+    @abstractmethod
+    def convert(self, data):
+        """
+        Returns the parsed value, raises ValueError if data is not valid.
+        """
+        pass
 
     def is_valid(self, data) -> bool:
         try:
-            datetime.fromisoformat(data)
+            self.convert(data)
         except ValueError:
             return False
         return True
 
 
-class Datetime(ValidationRule):
+class IsoDatetime(ConversionRule):
+
+    __slots__ = ()
+    types = str
+    output_type = datetime
+
+    def invalid_str(self):
+        return f"must be a ISO Datetime Format."
+
+    def convert(self, data):
+        return datetime.fromisoformat(data)
+
+
+class Datetime(ConversionRule):
+
+    __slots__ = ("_df_format",)
+    types = str
+    output_type = datetime
 
     def __init__(self, dt_format):
         self._df_format = self._param_validate(dt_format, str)
 
+    def invalid_str(self):
+        return f"must be a Datetime Format: {self._df_format}"
+
+    def convert(self, data):
+        return datetime.strptime(data, self._df_format)
+
+
+class Uuid(ConversionRule):
+
+    __slots__ = ("_version", "_parse")
+    types = str
+
+    def __init__(self, version=None):
+        if version is not None:
+            self._param_validate(version, int)
+        self._version = version
+        from uuid import UUID
+        self._parse = UUID
+
+    @property
+    def output_type(self):
+        return self._parse
+
+    def invalid_str(self):
+        if self._version is None:
+            return "must be a UUID."
+        return f"must be a UUID version {self._version}."
+
+    def convert(self, data):
+        value = self._parse(data)
+        if self._version is not None and value.version != self._version:
+            raise ValueError(data)
+        return value
+
+
+class IpAddress(ConversionRule):
+
+    __slots__ = ("_version", "_parse")
+    types = str
+
+    def __init__(self, version=None):
+        if version not in (None, 4, 6):
+            raise InvalidRuleParameter(version, "4 or 6")
+        self._version = version
+        from ipaddress import ip_address
+        self._parse = ip_address
+
+    @property
+    def output_type(self):
+        from ipaddress import IPv4Address, IPv6Address
+        if self._version == 4:
+            return IPv4Address
+        if self._version == 6:
+            return IPv6Address
+        return (IPv4Address, IPv6Address)
+
+    def invalid_str(self):
+        if self._version is None:
+            return "must be an IP address."
+        return f"must be an IPv{self._version} address."
+
+    def convert(self, data):
+        value = self._parse(data)
+        if self._version is not None and value.version != self._version:
+            raise ValueError(data)
+        return value
+
+
+class Decimal(ConversionRule):
+
+    __slots__ = ("_parse", "_invalid")
+    types = str
+    # decimal.Decimal은 int, float처럼 비교되므로, 숫자 Rule(Min, Max, ...)을 허용
+    output_type = (int, float)
+
+    def __init__(self):
+        import decimal
+        self._parse = decimal.Decimal
+        self._invalid = decimal.InvalidOperation
+
+    def invalid_str(self):
+        return "must be a decimal number string."
+
+    def convert(self, data):
+        try:
+            value = self._parse(data)
+        except self._invalid:
+            raise ValueError(data)
+        if not value.is_finite():
+            raise ValueError(data)
+        return value
+
+
+class Coerce(ConversionRule):
+    """
+    Convert the data with func. (Coerce(Fraction), Coerce(json.loads))
+    ValueError, TypeError and ArithmeticError of func mean invalid data.
+    """
+    __slots__ = ("_func", "_types")
+
+    def __init__(self, func, types=All):
+        if not callable(func):
+            raise InvalidRuleParameter(func, "callable")
+        self._func = func
+        self._types = types
+
     @property
     def types(self):
-        return str
+        return self._types
 
     def invalid_str(self):
-        return f"must be a Datetime Format: {self._df_format}"
+        name = getattr(self._func, '__name__', repr(self._func))
+        return f"can't be converted by {name}."
 
-    def is_valid(self, data) -> bool:
+    def convert(self, data):
         try:
-            datetime.strptime(data, self._df_format)
-            return True
-        except ValueError:
-            return False
+            return self._func(data)
+        except (TypeError, ArithmeticError) as e:
+            raise ValueError(data) from e
+
 
 REGEX_EMAIL = (
     r"^[a-zA-Z0-9.!#$%&'*+\/=?^_`{|}~-]+@"
@@ -175,50 +473,104 @@ REGEX_EMAIL = (
 
 class Email(ValidationRule):
 
-    @property
-    def types(self):
-        return str
+    __slots__ = ("_fullmatch",)
+    types = str
+
+    def __init__(self):
+        import re
+        self._fullmatch = re.compile(REGEX_EMAIL).fullmatch
 
     def invalid_str(self):
         return f"must be a Email Format."
 
     def is_valid(self, data) -> bool:
-        return bool(re.fullmatch(pattern=REGEX_EMAIL, string=data))
+        return self._fullmatch(data) is not None
 
 REGEX_PHONE_NUM = r"^(\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]\d{3,4}[\s.-]\d{4}$"
 
 class PhoneNum(ValidationRule):
 
-    @property
-    def types(self):
-        return str
+    __slots__ = ("_fullmatch",)
+    types = str
+
+    def __init__(self):
+        import re
+        self._fullmatch = re.compile(REGEX_PHONE_NUM).fullmatch
 
     def invalid_str(self):
         return f"must be a PhoneNumber Format."
 
     def is_valid(self, data) -> bool:
-        return bool(re.fullmatch(pattern=REGEX_PHONE_NUM, string=data))
+        return self._fullmatch(data) is not None
+
+
+REGEX_BACKREF = r"\\[1-9]|\(\?P="
 
 
 class Regex(ValidationRule):
 
+    __slots__ = ("_p_str", "_pattern", "_search")
+    types = str
+
     def __init__(self, pattern):
         self._p_str = self._param_validate(pattern, str)
-        self._pattern = re.compile(self._param_validate(self._p_str, str))
-
-    @property
-    def types(self):
-        return str
+        import re
+        self._pattern = re.compile(self._p_str)
+        self._search = self._pattern.search
 
     def invalid_str(self):
         return f"pattern does not match: {self._p_str}"
 
     def is_valid(self, data) -> bool:
-        return bool(self._pattern.search(data))
+        return self._search(data) is not None
+
+
+class RegexSet(ValidationRule):
+    """
+    Matches if any of the patterns matches.
+    The patterns are merged into one alternation, so the data is scanned once.
+    """
+    __slots__ = ("_p_strs", "_searches")
+    types = str
+
+    def __init__(self, patterns):
+        if not isinstance(patterns, (list, tuple)) or not patterns:
+            raise InvalidRuleParameter(patterns, (list, tuple))
+        for pattern in patterns:
+            self._param_validate(pattern, str)
+        self._p_strs = tuple(patterns)
+
+        import re
+        compiled = [re.compile(pattern) for pattern in self._p_strs]
+        try:
+            merged = re.compile(
+                "|".join(f"(?:{pattern})" for pattern in self._p_strs)
+            )
+        except re.error:
+            merged = None
+        # 그룹 번호 참조가 있는 경우, 병합하면 번호가 바뀌므로 개별 검사
+        if merged is None or any(
+            re.search(REGEX_BACKREF, pattern) for pattern in self._p_strs
+        ):
+            self._searches = tuple(pattern.search for pattern in compiled)
+        else:
+            self._searches = (merged.search,)
+
+    def invalid_str(self):
+        return f"pattern does not match any of: {list(self._p_strs)}"
+
+    def is_valid(self, data) -> bool:
+        for search in self._searches:
+            if search(data) is not None:
+                return True
+        return False
 
 
 class Ext(ValidationRule):
 
+    __slots__ = ("extensions",)
+    types = FileObj
+
     def __init__(self, extensions):
         if not isinstance(extensions, (list, tuple)):
             extensions = [extensions]
@@ -226,34 +578,30 @@ class Ext(ValidationRule):
             self._param_validate(ext, str)
         self.extensions = extensions
 
-    @property
-    def types(self):
-        return FileObj
-
     def invalid_str(self):
         return f'is not matched extension: {self.extensions}'
 
+    def match(self, filename):
+        for ext in self.extensions:
+            if filename.endswith(ext):
+                return True
+        return False
+
     def is_valid(self, file_list) -> bool:
         for file in file_list:
-            check = False
-            for ext in self.extensions:
-                if file.filename.endswith(ext):
-                    check = True
-                    break
-            if not check:
+            if not self.match(file.filename):
                 return False
         return True
 
 
 class MaxFileCount(ValidationRule):
 
+    __slots__ = ("max_num",)
+    types = FileObj
+
     def __init__(self, max_num):
         self.max_num = self._param_validate(max_num, int)
 
-    @property
-    def types(self):
-        return FileObj
-
     def invalid_str(self):
         return f'File Count must smaller than {self.max_num}.'
 
@@ -263,15 +611,151 @@ class MaxFileCount(ValidationRule):
 
 class MinFileCount(ValidationRule):
 
+    __slots__ = ("min_num",)
+    types = FileObj
+
     def __init__(self, min_num):
         self.min_num = self._param_validate(min_num, int)
 
-    @property
-    def types(self):
-        return FileObj
-
     def invalid_str(self):
         return f'File Count must smaller than {self.min_num}.'
 
     def is_valid(self, file_list) -> bool:
-        return len(file_list) >= self.min_num
\ No newline at end of file
+        return len(file_list) >= self.min_num
+
+
+def _file_size(file):
+    stream = file.stream
+    position = stream.tell()
+    stream.seek(0, 2)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+
+class MaxFileSize(ValidationRule):
+    """
+    With File params, enforced while the upload is parsed.
+    """
+    __slots__ = ("max_bytes",)
+    types = FileObj
+
+    def __init__(self, max_bytes):
+        self.max_bytes = self._param_validate(max_bytes, int)
+
+    def invalid_str(self):
+        return f'File size must be at most {self.max_bytes} bytes.'
+
+    def is_valid(self, file_list) -> bool:
+        for file in file_list:
+            if _file_size(file) > self.max_bytes:
+                return False
+        return True
+
+
+class MaxTotalFileSize(ValidationRule):
+    """
+    Byte budget of the uploaded files.
+    With File params, enforced while the upload is parsed, over the files
+    of every param of the request. Otherwise, over the files of the param.
+    """
+    __slots__ = ("max_bytes",)
+    types = FileObj
+
+    def __init__(self, max_bytes):
+        self.max_bytes = self._param_validate(max_bytes, int)
+
+    def invalid_str(self):
+        return f'Total file size must be at most {self.max_bytes} bytes.'
+
+    def is_valid(self, file_list) -> bool:
+        return sum(_file_size(file) for file in file_list) <= self.max_bytes
+
+
+class ContentType(ValidationRule):
+    """
+    Content-Type of each file part. ("image/png", "image/*")
+    """
+    __slots__ = ("content_types", "_exact", "_prefixes")
+    types = FileObj
+
+    def __init__(self, content_types):
+        if not isinstance(content_types, (list, tuple)):
+            content_types = [content_types]
+        for content_type in content_types:
+            self._param_validate(content_type, str)
+        self.content_types = content_types
+        self._exact = frozenset(
+            content_type.lower() for content_type in content_types
+            if not content_type.endswith("/*")
+        )
+        self._prefixes = tuple(
+            content_type[:-1].lower() for content_type in content_types
+            if content_type.endswith("/*")
+        )
+
+    def invalid_str(self):
+        return f'is not matched content type: {self.content_types}'
+
+    def match(self, content_type):
+        mimetype = (content_type or "").split(";", 1)[0].strip().lower()
+        return mimetype in self._exact or mimetype.startswith(self._prefixes)
+
+    def is_valid(self, file_list) -> bool:
+        for file in file_list:
+            if not self.match(file.content_type):
+                return False
+        return True
+
+
+FILE_SIGNATURES = {
+    "png": (b"\x89PNG\r\n\x1a\n",),
+    "jpeg": (b"\xff\xd8\xff",),
+    "gif": (b"GIF87a", b"GIF89a"),
+    "pdf": (b"%PDF-",),
+    "zip": (b"PK\x03\x04",),
+    "gzip": (b"\x1f\x8b",),
+}
+
+
+class MagicBytes(ValidationRule):
+    """
+    Leading bytes of each file. (MagicBytes(["png", "jpeg"]), MagicBytes(b"%PDF-"))
+    Known kinds: png, jpeg, gif, pdf, zip, gzip
+    """
+    __slots__ = ("kinds", "prefixes", "head_size")
+    types = FileObj
+
+    def __init__(self, signatures):
+        if not isinstance(signatures, (list, tuple)):
+            signatures = [signatures]
+        self.kinds = signatures
+        prefixes = []
+        for signature in signatures:
+            if isinstance(signature, bytes) and signature:
+                prefixes.append(signature)
+            elif isinstance(signature, str) and signature in FILE_SIGNATURES:
+                prefixes.extend(FILE_SIGNATURES[signature])
+            else:
+                raise InvalidRuleParameter(signature, "bytes or known kind")
+        if not prefixes:
+            raise InvalidRuleParameter(signatures, "bytes or known kind")
+        self.prefixes = tuple(prefixes)
+        self.head_size = max(len(prefix) for prefix in self.prefixes)
+
+    def invalid_str(self):
+        return f'is not matched file signature: {self.kinds}'
+
+    def match(self, head):
+        return head.startswith(self.prefixes)
+
+    def is_valid(self, file_list) -> bool:
+        for file in file_list:
+            stream = file.stream
+            position = stream.tell()
+            stream.seek(0)
+            head = stream.read(self.head_size)
+            stream.seek(position)
+            if not self.match(head):
+                return False
+        return True
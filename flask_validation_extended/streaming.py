@@ -0,0 +1,224 @@
+"""
+Streaming
+# Incremental extraction of Json params from the request stream. (ijson)
+    - Only the declared top-level keys are built, the others are skipped.
+    - Type of List, Dict annotations is validated while the bytes are read.
+    - MaxLen, MinLen rules are validated while the bytes are read.
+"""
+from flask import request
+from .params import Json
+from .types import All, List, Dict, BUILTIN_TYPES
+from .rules import MaxLen, MinLen
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+CONTAINER_STARTS = {"start_map": dict, "start_array": list}
+CONTAINER_ENDS = {"end_map", "end_array"}
+
+
+class StreamAbort(Exception):
+    """
+    Raised as soon as a streamed Json param is invalid.
+    """
+    def __init__(self, step, check, message):
+        self.step = step
+        self.check = check
+        self.message = message
+
+    def failure(self):
+        return self.step.failure(self.check, self.message)
+
+
+def _as_union(annotation):
+    if isinstance(annotation, (list, tuple)):
+        return annotation
+    return [annotation]
+
+
+def _child_annotation(annotation, container):
+    """
+    Annotation of the items of the container, validated against annotation.
+    None means the items can't be checked while streaming.
+    Returns (matched, child_annotation).
+    """
+    if annotation is None:
+        return True, None
+    items = []
+    for ann in annotation:
+        if ann is All or ann is container:
+            return True, None
+        if isinstance(ann, List):
+            if (container is dict) is isinstance(ann, Dict):
+                items.append(ann.item)
+        elif not (isinstance(ann, type) and ann in BUILTIN_TYPES):
+            # 스트리밍 중 판별할 수 없는 타입은 최종 타입 검증에 맡김
+            return True, None
+    if not items:
+        return False, None
+    if len(items) > 1:
+        return True, None
+    return True, _as_union(items[0])
+
+
+def _scalar_valid(annotation, value):
+    if annotation is None:
+        return True
+    for ann in annotation:
+        if ann is All:
+            return True
+        if isinstance(ann, type):
+            if ann in BUILTIN_TYPES and isinstance(value, ann):
+                return True
+        elif not isinstance(ann, List):
+            return True
+    return False
+
+
+class StreamField:
+    """
+    Precomputed streaming checks of a Json step.
+    """
+    def __init__(self, step):
+        self.step = step
+        self.annotation = step.annotation
+        self.max_lens = tuple(
+            rule for rule in step.rules if isinstance(rule, MaxLen)
+        )
+        self.min_lens = tuple(
+            rule for rule in step.rules if isinstance(rule, MinLen)
+        )
+
+    def abort_type(self):
+        raise StreamAbort(self.step, "type", self.step.type_message)
+
+    def abort_rule(self, rule):
+        raise StreamAbort(
+            self.step, rule.__class__.__name__,
+            self.step.rule_prefix + rule.invalid_str()
+        )
+
+    def child(self, annotation, event):
+        matched, child = _child_annotation(
+            annotation, CONTAINER_STARTS[event]
+        )
+        if not matched:
+            self.abort_type()
+        return child
+
+    def check_count(self, data):
+        for rule in self.max_lens:
+            if not rule.is_valid(data):
+                self.abort_rule(rule)
+
+    def check_end(self, data):
+        for rule in self.min_lens:
+            if not rule.is_valid(data):
+                self.abort_rule(rule)
+
+
+def _skip(events, event):
+    if event not in CONTAINER_STARTS:
+        return
+    depth = 1
+    for _, event, _ in events:
+        if event in CONTAINER_STARTS:
+            depth += 1
+        elif event in CONTAINER_ENDS:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _build(events, event, value, field):
+    if event not in CONTAINER_STARTS:
+        return value
+
+    # frame: [data, annotation of items, pending map key]
+    root = [CONTAINER_STARTS[event](), field.child(field.annotation, event), None]
+    frames = [root]
+    for _, event, value in events:
+        frame = frames[-1]
+        if event == "map_key":
+            frame[2] = value
+            continue
+
+        if event in CONTAINER_ENDS:
+            frames.pop()
+            if not frames:
+                field.check_end(root[0])
+                return root[0]
+            value = frame[0]
+            frame = frames[-1]
+        elif event in CONTAINER_STARTS:
+            frames.append(
+                [CONTAINER_STARTS[event](), field.child(frame[1], event), None]
+            )
+            continue
+        elif not _scalar_valid(frame[1], value):
+            field.abort_type()
+
+        if isinstance(frame[0], list):
+            frame[0].append(value)
+        else:
+            frame[0][frame[2]] = value
+        if frame is root:
+            field.check_count(root[0])
+
+
+class _Reader:
+    """
+    Werkzeug's LimitedStream treats read(0) as a client disconnect,
+    while ijson probes the stream with read(0).
+    """
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, size=-1):
+        if size == 0:
+            return b""
+        return self.stream.read(size)
+
+
+def extract(stream, fields):
+    """
+    Extract the declared top-level keys from the JSON stream.
+    fields: {key: StreamField}
+    """
+    result = {}
+    events = iter(ijson.parse(stream, use_float=True))
+    try:
+        _, event, _ = next(events)
+        if event != "start_map":
+            return {}
+        for _, event, key in events:
+            if event == "end_map":
+                break
+            _, event, value = next(events)
+            field = fields.get(key)
+            if field is None:
+                _skip(events, event)
+            else:
+                result[key] = _build(events, event, value, field)
+    except (ijson.JSONError, StopIteration):
+        return {}
+    return result
+
+
+def make_stream_loader(plan):
+    """
+    Json source loader streaming the request body for the plan.
+    """
+    if ijson is None:
+        raise ImportError('"stream_json" requires ijson. (pip install ijson)')
+    fields = {
+        step.key: StreamField(step) for step in plan if step.source is Json
+    }
+
+    def load_json(kwargs):
+        if not request.is_json:
+            return {}
+        return extract(_Reader(request.stream), fields)
+    return load_json
@@ -2,23 +2,50 @@
 Types
 # Supported Types
     - Builtin Types: int, str, float, bool, list, dict
-    - Custom Types: List, Dict, All
+    - Custom Types: List, Dict, Object, All
+    - Batch: list of records of Json params (see batch.py)
 """
-from .exceptions import InvalidCustomTypeArgument
+from .exceptions import (
+    InvalidCustomTypeArgument, InvalidBatchArgument,
+    InvalidDefault, InvalidOptional, InvalidRule
+)
 
 SINGLE_TYPES = {int, str, float, bool}
+# 아직 컴파일되지 않은 filler (None은 채울 default가 없음을 의미)
+_UNCOMPILED = object()
 BUILTIN_TYPES = {int, str, float, bool, list, dict}
 
 
 class CustomType:
 
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if hasattr(self, name)
+        }
+        # 컴파일된 검사 함수는 pickle할 수 없으므로, 역직렬화 후 다시 컴파일
+        if "_checker" in state:
+            state["_checker"] = None
+        state.pop("_filler", None)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        if hasattr(type(self), "_filler"):
+            self._filler = _UNCOMPILED
+
     @staticmethod
     def _type_valid(item):
         try:
             return (
                 item in BUILTIN_TYPES or
                 item is All or
-                type(item) in {List, Dict}
+                type(item) in {List, Dict, Object}
             )
         except TypeError:
             return False
@@ -33,21 +60,25 @@ class CustomType:
 
 
 class All(CustomType):
-    pass
+    __slots__ = ()
 
 
 class FileObj(CustomType):
-    pass
+    __slots__ = ()
 
 
 class List(CustomType):
 
+    __slots__ = ("item", "_checker", "_filler", "__name__")
+    org_type = list
+
     def __init__(self, item=All):
         if self._item_valid(item):
             self.item = item
         else:
             raise InvalidCustomTypeArgument("Types in CustomType")
-        self._org_type = list
+        self._checker = None
+        self._filler = _UNCOMPILED
         self.__name__ = self.__str__()
 
     def __str__(self):
@@ -58,13 +89,11 @@ class List(CustomType):
         except AttributeError:
             raise InvalidCustomTypeArgument("Types in CustomType")
 
-    @property
-    def org_type(self):
-        return self._org_type
-
 
 class Dict(List):
 
+    __slots__ = ()
+
     def __str__(self):
         try:
             if isinstance(self.item, (tuple, list)):
@@ -74,29 +103,381 @@ class Dict(List):
             raise InvalidCustomTypeArgument("Types in CustomType")
 
 
-def type_check(data, annotation):
-    if isinstance(annotation, Dict):
+class Field(CustomType):
+    """
+    Named field of Object.
+    """
+    __slots__ = ("annotation", "default", "rules", "optional")
+
+    def __init__(self, annotation=All, default=None, rules=None, optional=False):
+        if not self._item_valid(annotation):
+            raise InvalidCustomTypeArgument("Fields in Object")
+        if not isinstance(annotation, (list, tuple)):
+            annotation = [annotation]
+        self.annotation = annotation
+
+        if default is not None and not type_check(default, annotation):
+            raise InvalidDefault()
+        self.default = default
+
+        # rules 모듈이 types 모듈을 참조하므로, 순환 참조를 피하기 위해 지연 import
+        from .rules import validate_rules, AsyncValidationRule
+        rules = [] if rules is None else rules
+        if not isinstance(rules, (tuple, list)):
+            rules = [rules]
+        # Object는 동기적으로 검사되므로, 비동기 Rule은 사용할 수 없음
+        for rule in rules:
+            if isinstance(rule, AsyncValidationRule):
+                raise InvalidRule(rule.__class__.__name__)
+        self.rules = tuple(validate_rules(annotation, rules))
+
+        if not isinstance(optional, bool):
+            raise InvalidOptional()
+        self.optional = optional
+
+
+class Object(CustomType):
+    """
+    dict with named fields, validated in a single pass.
+    Missing fields with default are filled in the data.
+
+    Object(name=str, age=Field(int, rules=Min(0)))
+    Object({"first-name": str})
+    """
+    __slots__ = ("fields", "_checker", "_filler", "__name__")
+    org_type = dict
+
+    def __init__(self, *args, **fields):
+        if args:
+            if len(args) > 1 or not isinstance(args[0], dict):
+                raise InvalidCustomTypeArgument("Fields in Object")
+            fields = {**args[0], **fields}
+        self.fields = {}
+        for name, field in fields.items():
+            if not isinstance(field, Field):
+                field = Field(field)
+            self.fields[name] = field
+        self._checker = None
+        self._filler = _UNCOMPILED
+        self.__name__ = self.__str__()
+
+    def __str__(self):
+        return f"Object({', '.join(self.fields)})"
+
+    def explain(self, data):
+        """
+        Describe why data is not valid. (only for error messages)
+        """
         if not isinstance(data, dict):
+            return "must be an object."
+        for name, field in self.fields.items():
+            value = data.get(name)
+            if value is None:
+                if field.default is None and not field.optional:
+                    return f"field '{name}' not given."
+                continue
+            if not type_check(value, field.annotation):
+                for annotation in field.annotation:
+                    if isinstance(annotation, Object):
+                        detail = annotation.explain(value)
+                        if detail:
+                            return f"field '{name}': {detail}"
+                return (
+                    f"field '{name}' is not "
+                    f"{[str(i) for i in field.annotation]}."
+                )
+            for rule in field.rules:
+                if not rule.is_valid(value):
+                    return f"field '{name}': {rule.invalid_str()}"
+        return None
+
+
+class Batch(CustomType):
+    """
+    list of records validated one by one, only for Json params.
+    The view receives the valid records (BatchResult) and per-index errors.
+
+    Batch(Object(name=str, age=Field(int, rules=Min(0))))
+    Batch({"name": str}, partial=False)
+    """
+    __slots__ = ("schema", "partial", "max_errors", "max_records", "__name__")
+    org_type = list
+
+    def __init__(self, schema, partial=True, max_errors=None, max_records=None):
+        if isinstance(schema, dict):
+            schema = Object(schema)
+        if not isinstance(schema, Object):
+            raise InvalidBatchArgument(schema)
+        if not isinstance(partial, bool):
+            raise InvalidBatchArgument(partial)
+        for limit in (max_errors, max_records):
+            if limit is not None and (
+                not isinstance(limit, int) or isinstance(limit, bool)
+            ):
+                raise InvalidBatchArgument(limit)
+        if max_errors is not None and max_errors < 1:
+            raise InvalidBatchArgument(max_errors)
+        self.schema = schema
+        self.partial = partial
+        self.max_errors = max_errors
+        self.max_records = max_records
+        self.__name__ = self.__str__()
+
+    def __str__(self):
+        return f"Batch({self.schema})"
+
+
+def _accept_all(data):
+    return True
+
+
+def _compile_container(container, items, annotation, item_rules=()):
+    """
+    Compile the checker of List, Dict.
+    items: extracts the values to check from the container.
+    item_rules: rules evaluated on each item, in the same pass.
+    """
+    item = annotation.item
+    if (item is All or item == [All]) and not item_rules:
+        return lambda data: isinstance(data, container)
+
+    item_types = _builtin_union(item)
+    if item_types is not None:
+        # 내부 원소가 builtin 타입인 경우, 원소별 함수 호출 없이 검사
+        if not item_rules:
+            def check(data):
+                if not isinstance(data, container):
+                    return False
+                for value in items(data):
+                    if not isinstance(value, item_types):
+                        return False
+                return True
+            return check
+
+        def check(data):
+            if not isinstance(data, container):
+                return False
+            for value in items(data):
+                if not isinstance(value, item_types):
+                    return False
+                for rule in item_rules:
+                    if not rule.is_valid(value):
+                        return False
+            return True
+        return check
+
+    item_check = compile_type_check(item)
+
+    def check(data):
+        if not isinstance(data, container):
             return False
-        for value in data.values():
-            if not type_check(value, annotation.item):
+        for value in items(data):
+            if not item_check(value):
                 return False
+            for rule in item_rules:
+                if not rule.is_valid(value):
+                    return False
         return True
+    return check
 
-    elif isinstance(annotation, List):
-        if not isinstance(data, list):
+
+def _compile_fused(annotation, item_rules):
+    """
+    Compile the checker of List, Dict annotations,
+    fused with the rules of their items.
+    """
+    if not isinstance(annotation, (tuple, list)):
+        annotation = [annotation]
+    checks = []
+    for ann in annotation:
+        if ann is list:
+            ann = List()
+        elif ann is dict:
+            ann = Dict()
+        if isinstance(ann, Dict):
+            checks.append(
+                _compile_container(dict, _dict_items, ann, item_rules)
+            )
+        elif isinstance(ann, List):
+            checks.append(
+                _compile_container(list, _list_items, ann, item_rules)
+            )
+        else:
+            checks.append(compile_type_check(ann))
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+    return lambda data: any(check(data) for check in checks)
+
+
+def _compile_object(annotation):
+    fields = tuple(
+        (
+            name, field.default, field.optional,
+            compile_type_check(field.annotation), field.rules
+        )
+        for name, field in annotation.fields.items()
+    )
+
+    def check(data):
+        if not isinstance(data, dict):
             return False
-        for item in data:
-            if not type_check(item, annotation.item):
+        for name, default, optional, field_check, rules in fields:
+            value = data.get(name)
+            if value is None:
+                # default는 검사를 통과한 이후 fill_defaults로 채움
+                if default is not None:
+                    value = default
+                elif optional:
+                    continue
+                else:
+                    return False
+            elif not field_check(value):
                 return False
+            for rule in rules:
+                if not rule.is_valid(value):
+                    return False
         return True
+    return check
+
+
+def _list_items(data):
+    return data
+
+
+def _dict_items(data):
+    return data.values()
+
+
+def _builtin_union(annotation):
+    """
+    annotation이 builtin 타입(또는 그 union)인 경우 isinstance용 tuple 반환
+    """
+    if not isinstance(annotation, (tuple, list)):
+        annotation = (annotation,)
+    for ann_i in annotation:
+        if not isinstance(ann_i, type) or ann_i not in BUILTIN_TYPES:
+            return None
+    return tuple(annotation)
+
+
+def compile_type_check(annotation, item_rules=()):
+    """
+    Compile annotation into a specialized checker callable.
+    Checkers of List, Dict are cached on the annotation itself.
+    """
+    if item_rules:
+        return _compile_fused(annotation, item_rules)
+
+    elif isinstance(annotation, List):
+        if annotation._checker is None:
+            if isinstance(annotation, Dict):
+                annotation._checker = _compile_container(
+                    dict, _dict_items, annotation
+                )
+            else:
+                annotation._checker = _compile_container(
+                    list, _list_items, annotation
+                )
+        return annotation._checker
+
+    elif isinstance(annotation, Batch):
+        return lambda data: isinstance(data, list)
+
+    elif isinstance(annotation, Object):
+        if annotation._checker is None:
+            annotation._checker = _compile_object(annotation)
+        return annotation._checker
 
     elif isinstance(annotation, (tuple, list)):
-        for ann_i in annotation:
-            if type_check(data, ann_i):
-                return True
-        return False
+        if any(ann_i is All for ann_i in annotation):
+            return _accept_all
+        if len(annotation) == 1:
+            return compile_type_check(annotation[0])
+        types = _builtin_union(annotation)
+        if types is not None:
+            return lambda data: isinstance(data, types)
+        checks = tuple(compile_type_check(ann_i) for ann_i in annotation)
+        return lambda data: any(check(data) for check in checks)
+
+    elif annotation is All:
+        return _accept_all
 
     else:
-        return annotation is All or \
-               isinstance(data, annotation)
\ No newline at end of file
+        return lambda data: isinstance(data, annotation)
+
+
+def type_check(data, annotation):
+    return compile_type_check(annotation)(data)
+
+
+def compile_fill_defaults(annotation):
+    """
+    Compile the filler of the missing Object fields with their defaults.
+    The checker has no side effects, so the filler is called
+    only after the data has passed it. None if there is no default to fill.
+    Fillers of List, Dict, Object are cached on the annotation itself.
+    """
+    if isinstance(annotation, (List, Object)):
+        if annotation._filler is _UNCOMPILED:
+            if isinstance(annotation, Object):
+                annotation._filler = _compile_object_filler(annotation)
+            else:
+                annotation._filler = _compile_container_filler(annotation)
+        return annotation._filler
+
+    elif isinstance(annotation, (tuple, list)):
+        alternatives = tuple(
+            (compile_type_check(ann_i), compile_fill_defaults(ann_i))
+            for ann_i in annotation
+        )
+        if all(fill is None for _, fill in alternatives):
+            return None
+        if len(alternatives) == 1:
+            return alternatives[0][1]
+
+        def fill(data):
+            # union의 경우, 검사를 통과한 첫번째 어노테이션 기준으로 채움
+            for check, fill_i in alternatives:
+                if check(data):
+                    if fill_i is not None:
+                        fill_i(data)
+                    return
+        return fill
+
+    return None
+
+
+def _compile_container_filler(annotation):
+    fill_item = compile_fill_defaults(annotation.item)
+    if fill_item is None:
+        return None
+    items = _dict_items if isinstance(annotation, Dict) else _list_items
+
+    def fill(data):
+        for value in items(data):
+            fill_item(value)
+    return fill
+
+
+def _compile_object_filler(annotation):
+    fields = tuple(
+        (name, field.default, compile_fill_defaults(field.annotation))
+        for name, field in annotation.fields.items()
+    )
+    fields = tuple(
+        (name, default, fill_i) for name, default, fill_i in fields
+        if default is not None or fill_i is not None
+    )
+    if not fields:
+        return None
+
+    def fill(data):
+        for name, default, fill_i in fields:
+            value = data.get(name)
+            if value is None:
+                if default is not None:
+                    data[name] = default
+            elif fill_i is not None:
+                fill_i(value)
+    return fill
@@ -1,147 +1,223 @@
-from inspect import signature
+import sys
+from inspect import iscoroutinefunction
 from functools import wraps
 from flask import request, g
 from .params import Route, Query, Json, Form, File, Header
-from .types import type_check, All, FileObj
+from .plans import compile_plan, sources_of
+from .core import compile_runner, check_max_errors
+from .decoders import resolve_json_decoder, make_json_loader
+from .streaming import StreamAbort, make_stream_loader
+from .multipart import make_multipart_loader
+from .vectorize import require_numpy
+from .instrument import observe_plan
+from .exceptions import InvalidAsyncRule
+
+
+def _load_header(kwargs):
+    return request.environ
+
+
+def _load_route(kwargs):
+    return kwargs
+
+
+def _load_json(kwargs):
+    return request.get_json(silent=True) or {}
+
+
+def _load_query(kwargs):
+    return request.args
+
+
+def _load_form(kwargs):
+    return request.form
+
+
+def _load_file(kwargs):
+    return request.files
+
+
+SOURCE_LOADERS = {
+    Header: _load_header,
+    Route: _load_route,
+    Json: _load_json,
+    Query: _load_query,
+    Form: _load_form,
+    File: _load_file,
+}
 
 
 class Validator:
     """
     Main validation class
     """
-    def __init__(self, error_function=None):
+    def __init__(
+            self,
+            error_function=None,
+            codegen=False,
+            dump_source=False,
+            collect_errors=False,
+            max_errors=None,
+            json_decoder=None,
+            stream_json=False,
+            numpy_threshold=None,
+            numpy_output=False,
+            on_param_validated=None,
+            on_rule_evaluated=None,
+            failure_tracker=None,
+            executor=None,
+            executor_threshold=10000
+    ):
         self.error_func = error_function if error_function else self.default_error
+        self.codegen = codegen
+        self.dump_source = dump_source
+        self.collect_errors = collect_errors
+        self.max_errors = check_max_errors(max_errors)
+        self.stream_json = stream_json
+        if numpy_threshold is not None:
+            require_numpy()
+        self.numpy_threshold = numpy_threshold
+        self.numpy_output = numpy_output
+        self.on_param_validated = on_param_validated
+        self.on_rule_evaluated = on_rule_evaluated
+        self.failure_tracker = failure_tracker
+        self.executor = executor
+        self.executor_threshold = executor_threshold
+        if json_decoder is None:
+            self.json_loader = _load_json
+        else:
+            self.json_loader = make_json_loader(
+                resolve_json_decoder(json_decoder)
+            )
 
     @staticmethod
     def default_error(error_message):
         return {"error": error_message}, 400
 
     def __call__(self, f):
-        @wraps(f)
-        def nested_func(**kwargs):
-            
-            if g.get('deactivate_validator'):
-                return f(**kwargs)
-
-            request_inputs = {
-                Header: dict(request.headers.items()),
-                Route: kwargs.copy(),
-                Json: request.get_json(silent=True) or {},
-                Query: request.args,
-                Form: request.form,
-                File: request.files
-            }
-
-            parsed_inputs = self.validate_parameters(
-                request_inputs, signature(f).parameters
+        # 데코레이터 적용 시점에 검증 계획을 미리 컴파일
+        plan = compile_plan(
+            f,
+            numpy_threshold=self.numpy_threshold,
+            numpy_output=self.numpy_output,
+            executor=self.executor,
+            executor_threshold=self.executor_threshold
+        )
+        # 계획에서 참조하는 입력 영역만 요청 시점에 파싱
+        if self.stream_json:
+            json_loader = make_stream_loader(plan)
+        else:
+            json_loader = self.json_loader
+        # File Rule은 multipart 본문을 파싱하는 중에 검증
+        source_loaders = {
+            **SOURCE_LOADERS,
+            Json: json_loader,
+            Form: make_multipart_loader(plan, _load_form),
+            File: make_multipart_loader(plan, _load_file),
+        }
+        loaders = tuple(
+            (source, source_loaders[source]) for source in sources_of(plan)
+        )
+        # 다른 blueprint의 같은 이름 view가 합쳐지지 않도록, 모듈 경로로 구분
+        view = f"{f.__module__}.{f.__qualname__}"
+        tracker = self.failure_tracker
+        on_param_validated = self.on_param_validated
+        if tracker is not None:
+            # 실패한 필드는 파라미터 계측 hook으로 집계
+            tracker.register(view, plan)
+            on_param_validated = tracker.param_hook(on_param_validated)
+
+        observed = (
+            on_param_validated is not None or
+            self.on_rule_evaluated is not None
+        )
+        if observed:
+            # 계측이 활성화된 경우에만, 계측용 계획 사본을 순회 (codegen 미적용)
+            run_plan = observe_plan(
+                plan, view,
+                on_param_validated, self.on_rule_evaluated
             )
-            if isinstance(parsed_inputs, dict):
-                return f(**parsed_inputs)
-            else:
-                return parsed_inputs
-        return nested_func
-
-    def validate_parameters(self, request_inputs, function_args):
-        parsed_inputs = {}
-        for arg in function_args.values():
-            param_name = arg.name  # ie. id, username
-            param_object = arg.default  # ie. Route(), Json()
-            param_annotation = param_object.annotation  # ie. str, int
-            param_object_name = param_object.__class__.__name__
-            is_required = not param_object.optional
-            valid_rules = param_object.rules
-
-            # 지정된 Param 클래스가 아닌 경우, 에러 반환
-            if param_object.__class__ not in request_inputs:
-                return self.error_func("Invalid parameter type.")
-
-            # Header에서 가져올 데이터의 경우, 별도로 입력받은 header_name으로 호출
-            if param_object.__class__ is Header:
-                user_input = request_inputs[Header].get(param_object.header_name)
-            elif param_object.__class__ is File:
-                user_input = request_inputs[File].getlist(param_name)
-                if not user_input:
-                    user_input = None
-                elif len(user_input) == 1 and user_input[0].filename == "":
-                    user_input = None
-            else:
-                user_input = request_inputs[param_object.__class__].get(param_name)
-
-            # 사용자의 정보가 입력되지 않았으나, default가 명시된 경우, 할당
-            if user_input is None and param_object.default is not None:
-                user_input = param_object.default
-
-            # 사용자의 인풋 및 default가 모두 없으며,
-            # optional이 아닌 경우, 에러 반환
-            elif user_input is None and is_required:
-                if param_object.__class__ is Header:
-                    return self.error_func(
-                        f"Required [{param_object_name}] parameter, "
-                        f"Header '{param_object.header_name}' not given."
-                    )
-                else:
-                    return self.error_func(
-                        f"Required [{param_object_name}] parameter, "
-                        f"'{param_name}' not given."
-                    )
-
-            # Query, Header, Form, Route의 경우, 타입 변환 시도.
-            # 지정된 타입으로의 convert 실패시, 에러 반환
-            if (
-                param_object.__class__ in {Header, Query, Form, Route} and
-                isinstance(user_input, str) and
-                param_annotation[0] not in [str, All]
-            ):
-                user_input, status = self._convert_parameter(user_input, param_annotation[0])
-                if not status:
-                    return self.error_func(
-                        f"In [{param_object_name}] Params, "
-                        f"'{param_name}' can't be converted to {param_annotation[0]}."
-                    )
-
-            # 사용자 입력값이 None이 아니며, type check에 실패한 경우
-            if (
-                user_input is not None and
-                param_annotation[0] is not FileObj and
-                not type_check(user_input, param_annotation)
-            ):
-                return self.error_func(
-                    f"In [{param_object_name}] Params, "
-                    f"'{param_name}' is not {[str(i) for i in param_annotation]}."
+        else:
+            run_plan = plan
+
+        # 검증 자체는 Flask와 무관한 core에 위임 (계측 중에는 codegen 미적용)
+        run, run_async, async_steps, validation_source = compile_runner(
+            run_plan,
+            collect_errors=self.collect_errors,
+            max_errors=self.max_errors,
+            codegen=self.codegen and not observed,
+            name=f.__qualname__
+        )
+        if validation_source is not None and self.dump_source:
+            print(validation_source, file=sys.stderr)
+
+        def reject():
+            if self.collect_errors:
+                return self.error_func([{
+                    "source": None, "field": None,
+                    "check": "rejected", "message": tracker.reject_message,
+                }])
+            return self.error_func(tracker.reject_message)
+
+        def validate(kwargs):
+            try:
+                request_inputs = {
+                    source: loader(kwargs) for source, loader in loaders
+                }
+            except StreamAbort as abort:
+                # 스트리밍 중 검증에 실패한 경우, 나머지 본문을 읽지 않고 에러 반환
+                if self.collect_errors:
+                    return {}, [abort.failure()]
+                return None, abort.message
+            return run(request_inputs)
+
+        if iscoroutinefunction(f):
+            @wraps(f)
+            async def nested_func(**kwargs):
+
+                if g.get('deactivate_validator'):
+                    return await f(**kwargs)
+
+                if tracker is not None:
+                    client_key = tracker.client_key()
+                    if tracker.is_blocked(client_key):
+                        return reject()
+
+                parsed_inputs, error = validate(kwargs)
+                # 비동기 Rule은 동기 검증 이후, 모든 파라미터에 대해 동시에 수행
+                if async_steps:
+                    error = await run_async(parsed_inputs, error)
+                if error:
+                    if tracker is not None:
+                        tracker.record_failure(view, client_key)
+                    return self.error_func(error)
+                return await f(**parsed_inputs)
+
+        else:
+            if async_steps:
+                raise InvalidAsyncRule(
+                    async_steps[0].async_rules[0].__class__.__name__
                 )
 
-            # 사용자 입력값이 None이 아니면, 입력된 Rule에 대하여 validation 개시
-            if user_input is not None:
-                for rule in valid_rules:
-                    if not rule.is_valid(user_input):
-                        return self.error_func(
-                            f'Parameter <{param_name}>: {rule.invalid_str()}'
-                        )
-
-            parsed_inputs[param_name] = user_input
-
-        return parsed_inputs
+            @wraps(f)
+            def nested_func(**kwargs):
 
-    @staticmethod
-    def _convert_parameter(data, annotation):
-
-        if annotation is int:
-            try:
-                return int(data), True
-            except ValueError:
-                return data, False
+                if g.get('deactivate_validator'):
+                    return f(**kwargs)
 
-        elif annotation is float:
-            try:
-                return float(data), True
-            except ValueError:
-                return data, False
+                # 실패율을 초과한 클라이언트는 본문 파싱 없이 즉시 거절
+                if tracker is not None:
+                    client_key = tracker.client_key()
+                    if tracker.is_blocked(client_key):
+                        return reject()
 
-        elif (
-            annotation is bool and
-            data.lower() in ['true', 'false']
-        ):
-            return data.lower() == 'true', True
-
-        return data, False
+                parsed_inputs, error = validate(kwargs)
+                if error:
+                    if tracker is not None:
+                        tracker.record_failure(view, client_key)
+                    return self.error_func(error)
+                return f(**parsed_inputs)
 
+        nested_func.validation_plan = plan
+        nested_func.validation_source = validation_source
+        return nested_func
@@ -0,0 +1,139 @@
+"""
+Vectorize
+# NumPy-backed validation of large numeric lists. (optional, numpy)
+    - Json(List(int)), Json(List(float)) above the threshold
+      are converted to ndarray once.
+    - Item rules (Each) implementing is_valid_array(array) are evaluated
+      on the whole array at once, instead of per element.
+    - Optionally, the view receives the ndarray instead of the list.
+      The list is converted after every rule of the Param, so the Param
+      rules (and async rules) always receive the list.
+    - numpy is imported only when a threshold is given.
+"""
+from .types import List
+
+# load_numpy() 호출 전까지는 import하지 않음 (import 비용이 큼)
+numpy = None
+
+DTYPES = {int: "int64", float: "float64"}
+
+
+def array_item(annotation):
+    """
+    int or float if annotation is List(int), List(float). Otherwise None.
+    """
+    if len(annotation) != 1 or type(annotation[0]) is not List:
+        return None
+    item = annotation[0].item
+    if isinstance(item, (list, tuple)):
+        if len(item) != 1:
+            return None
+        item = item[0]
+    return item if item in DTYPES else None
+
+
+def to_array(data, item):
+    try:
+        return numpy.asarray(data, dtype=DTYPES[item])
+    except OverflowError:
+        # int64 범위를 넘는 정수는 object 배열로 유지
+        return numpy.asarray(data, dtype=object)
+
+
+class Vectorizer:
+    """
+    Type check and item rules of a List(int), List(float) step.
+    Returns (value, failed check, error_message).
+    """
+    def __init__(self, step, item, threshold, array_rules=()):
+        self.step = step
+        self.item = item
+        self.threshold = threshold
+        self.array_rules = tuple(array_rules)
+
+    def __call__(self, data):
+        step = self.step
+        if (
+            not self.array_rules or
+            not isinstance(data, list) or
+            len(data) < self.threshold
+        ):
+            if not step.checker(data):
+                return (data,) + step.check_failure(data)
+            return data, None, None
+
+        # 원소 타입 검사는 C 레벨 isinstance로, 원소별 Rule은 배열 단위로 수행
+        if not step.type_checker(data):
+            return data, "type", step.type_error(data)
+        array = to_array(data, self.item)
+        if array.dtype == object:
+            # int64 범위를 넘는 정수가 있는 경우, 배열 단위 Rule 대신 원소별로 검사
+            if not step.checker(data):
+                return (data,) + step.check_failure(data)
+            return data, None, None
+        for rule in self.array_rules:
+            if not rule.is_valid_array(array):
+                return (data,) + step.check_failure(data)
+        return data, None, None
+
+
+class ArrayOutput:
+    """
+    Converts the validated list of a List(int), List(float) step to ndarray,
+    as the last step before the view. Shorter lists than threshold are kept.
+    """
+    def __init__(self, item, threshold):
+        self.item = item
+        self.threshold = threshold
+
+    def __call__(self, value):
+        if len(value) < self.threshold:
+            return value
+        return to_array(value, self.item)
+
+
+def load_numpy():
+    """
+    numpy module, imported on first use. None if it isn't installed.
+    """
+    global numpy
+    if numpy is None:
+        try:
+            import numpy as module
+        except ImportError:
+            return None
+        numpy = module
+    return numpy
+
+
+def require_numpy():
+    if load_numpy() is None:
+        raise ImportError(
+            '"numpy_threshold" requires numpy. (pip install numpy)'
+        )
+
+
+def vectorize_step(step, threshold):
+    """
+    Vectorizer of the step, or None if it isn't needed.
+    """
+    item = array_item(step.annotation)
+    if item is None:
+        return None
+    require_numpy()
+    if not step.item_rules or not all(
+        hasattr(rule, 'is_valid_array') for rule in step.item_rules
+    ):
+        return None
+    return Vectorizer(step, item, threshold, step.item_rules)
+
+
+def array_output(step, threshold):
+    """
+    ArrayOutput of the step, or None if it isn't a List(int), List(float) step.
+    """
+    item = array_item(step.annotation)
+    if item is None:
+        return None
+    require_numpy()
+    return ArrayOutput(item, threshold)
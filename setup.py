@@ -22,7 +22,8 @@ setup(
     license='MIT',
     keywords='flask validation extended',
     packages=['flask_validation_extended'],
-    install_requires=['flask'],
+    # multipart.py overrides FormDataParser._parse_multipart (Werkzeug 2.3+)
+    install_requires=['flask', 'Werkzeug>=2.3'],
     platforms='any',
     classifiers=[
         'Environment :: Web Environment',
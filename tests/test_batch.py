@@ -0,0 +1,131 @@
+import unittest
+from flask import Flask
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Json
+from flask_validation_extended.rules import Min, MinLen, Each, In
+from flask_validation_extended.types import Object, Field, Batch
+from flask_validation_extended.batch import validate_many, BatchResult
+from flask_validation_extended.exceptions import (
+    InvalidBatchArgument, InvalidAnnotationJson, InvalidRuleAnnotation
+)
+
+SCHEMA = {
+    "name": Field(str, rules=MinLen(2)),
+    "age": Field(int, rules=Min(0)),
+    "role": Field(str, default="member"),
+}
+
+
+class ValidateManyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.records = [
+            {"name": "iml", "age": 20},
+            {"name": "i", "age": 20},
+            "record",
+            {"name": "imiml", "age": 30, "role": "admin"},
+            {"name": "shin"},
+        ]
+
+    def test_partial(self):
+        result = validate_many(self.records, SCHEMA)
+        self.assertIsInstance(result, BatchResult)
+        self.assertEqual(result, [
+            {"name": "iml", "age": 20, "role": "member"},
+            {"name": "imiml", "age": 30, "role": "admin"},
+        ])
+        self.assertEqual(result.total, 5)
+        self.assertEqual(result.errors, [
+            {"index": 1, "message": "field 'name': must be at least 2 elements."},
+            {"index": 2, "message": "must be an object."},
+            {"index": 4, "message": "field 'age' not given."},
+        ])
+
+    def test_all_or_nothing(self):
+        result = validate_many(self.records, Object(SCHEMA), partial=False)
+        self.assertEqual(result, [])
+        self.assertEqual(len(result.errors), 3)
+
+        result = validate_many(self.records[:1], SCHEMA, partial=False)
+        self.assertEqual(len(result), 1)
+
+    def test_max_errors(self):
+        result = validate_many(self.records, SCHEMA, max_errors=2)
+        self.assertEqual([error["index"] for error in result.errors], [1, 2])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result.total, 3)
+        for max_errors in (0, -1, "2"):
+            with self.assertRaises(InvalidBatchArgument):
+                validate_many(self.records, SCHEMA, max_errors=max_errors)
+
+    def test_invalid_batch(self):
+        for kwargs in [
+            {"schema": str}, {"schema": SCHEMA, "partial": 1},
+            {"schema": SCHEMA, "max_errors": "1"},
+            {"schema": SCHEMA, "max_errors": 0},
+            {"schema": SCHEMA, "max_records": True},
+        ]:
+            with self.assertRaises(InvalidBatchArgument):
+                Batch(**kwargs)
+        with self.assertRaises(InvalidAnnotationJson):
+            Json([Batch(SCHEMA), list])
+        # 레코드는 schema로 검증되므로, Each는 사용할 수 없음
+        with self.assertRaises(InvalidRuleAnnotation):
+            Json(Batch(Object(a=int)), rules=Each(In([1])))
+
+
+class BatchParamTestCase(unittest.TestCase):
+
+    options = {}
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+
+        @app.route("/ingest", methods=["POST"])
+        @Validator(**self.options)
+        def ingest(
+                records=Json(Batch(SCHEMA, max_records=3), rules=MinLen(1)),
+                strict=Json(Batch({"id": int}, partial=False), optional=True)
+        ):
+            return {
+                "records": records, "errors": records.errors,
+                "strict": strict
+            }
+
+        self.client = app.test_client()
+
+    def test_partial(self):
+        res = self.client.post("/ingest", json={
+            "records": [{"name": "iml", "age": 1}, {"name": "iml", "age": -1}],
+            "strict": [{"id": 1}]
+        })
+        self.assertEqual(res.json, {
+            "records": [{"name": "iml", "age": 1, "role": "member"}],
+            "errors": [{"index": 1, "message": "field 'age': must be larger than 0."}],
+            "strict": [{"id": 1}]
+        })
+
+    def test_failed(self):
+        cases = [
+            ({"records": {}}, "In [Json] Params, 'records' is not ['Batch(Object(name, age, role))']."),
+            ({"records": [{}] * 4}, "Parameter <records>: must be at most 3 records."),
+            ({"records": [{}]}, "Parameter <records>: must be at least 1 elements."),
+            (
+                {"records": [{"name": "iml", "age": 1}], "strict": [{"id": 1}, {"id": "2"}]},
+                "Parameter <strict>: 1 of 2 records are invalid. "
+                "(index 1: field 'id' is not [\"<class 'int'>\"].)"
+            ),
+        ]
+        for body, error in cases:
+            res = self.client.post("/ingest", json=body)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.json["error"], error)
+
+
+class CodegenBatchParamTestCase(BatchParamTestCase):
+
+    options = {"codegen": True}
+
+
+if __name__ == '__main__':
+    unittest.main()
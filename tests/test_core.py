@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from flask_validation_extended.core import (
+    validate, validate_async, compile_params, MultiValues
+)
+from flask_validation_extended.params import Json, Query, Header, Route, Form
+from flask_validation_extended.rules import (
+    AsyncValidationRule, Min, MinLen, IsoDatetime
+)
+from flask_validation_extended.types import List
+from flask_validation_extended.exceptions import (
+    InvalidParameter, InvalidSource, InvalidAsyncRule, InvalidMaxErrors
+)
+
+
+class NotTaken(AsyncValidationRule):
+
+    @property
+    def types(self):
+        return str
+
+    async def is_valid(self, data):
+        return data != "taken"
+
+
+class ValidateTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.plan = compile_params({
+            "user_id": Json(int, rules=Min(1)),
+            "name": Json(str, default="iml"),
+            "token": Header("X-Api-Token", str),
+            "tags": Query(List(int), optional=True),
+            "page": Query(int, default=1),
+            "at": Route(str, rules=IsoDatetime(), convert=True),
+        })
+
+    def test_validate(self):
+        inputs, error = validate(self.plan, {
+            "json": {"user_id": 3},
+            "header": {"x-api-token": "secret"},
+            "query": {"tags": ["1", "2"], "page": "4"},
+            Route: {"at": "2022-01-01T00:00:00"},
+        })
+        self.assertIsNone(error)
+        self.assertEqual(inputs["user_id"], 3)
+        self.assertEqual(inputs["name"], "iml")
+        self.assertEqual(inputs["token"], "secret")
+        self.assertEqual(inputs["tags"], [1, 2])
+        self.assertEqual(inputs["page"], 4)
+        self.assertEqual(inputs["at"].year, 2022)
+
+    def test_failed(self):
+        sources = {
+            "json": {"user_id": 0},
+            "route": {"at": "2022-01-01"},
+        }
+        inputs, error = validate(self.plan, sources)
+        self.assertIsNone(inputs)
+        self.assertEqual(error, "Parameter <user_id>: must be larger than 1.")
+
+        inputs, failures = validate(self.plan, sources, collect_errors=True)
+        self.assertEqual(
+            [(failure["field"], failure["check"]) for failure in failures],
+            [("user_id", "Min"), ("X-Api-Token", "required")]
+        )
+        self.assertEqual(inputs["page"], 1)
+
+        for max_errors in (0, -1, 1.5, True):
+            with self.assertRaises(InvalidMaxErrors):
+                validate(
+                    self.plan, sources,
+                    collect_errors=True, max_errors=max_errors
+                )
+            with self.assertRaises(InvalidMaxErrors):
+                asyncio.run(validate_async(
+                    self.plan, sources,
+                    collect_errors=True, max_errors=max_errors
+                ))
+
+    def test_params(self):
+        inputs, error = validate(
+            {"name": Form(str, rules=MinLen(2))}, {"form": {"name": "iml"}}
+        )
+        self.assertEqual(inputs, {"name": "iml"})
+        with self.assertRaises(InvalidParameter):
+            validate({"name": str}, {})
+        with self.assertRaises(InvalidSource):
+            validate(self.plan, {"body": {}})
+        with self.assertRaises(InvalidAsyncRule):
+            validate({"name": Json(str, rules=NotTaken())}, {})
+
+    def test_validate_async(self):
+        params = {"name": Json(str, rules=[MinLen(2), NotTaken()])}
+        for body, expected in [
+            ({"name": "iml"}, ({"name": "iml"}, None)),
+            ({"name": "taken"}, (None, "Parameter <name>: doesn't not match the NotTaken rule")),
+            ({"name": "i"}, (None, "Parameter <name>: must be at least 2 elements.")),
+        ]:
+            result = asyncio.run(validate_async(params, {"json": body}))
+            self.assertEqual(result, expected)
+
+    def test_multi_values(self):
+        values = MultiValues({"a": ["1", "2"], "b": "3", "c": []})
+        self.assertEqual(values.get("a"), "1")
+        self.assertEqual(values.getlist("b"), ["3"])
+        self.assertIsNone(values.get("c"))
+        self.assertEqual(values.getlist("d"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import unittest
+import subprocess
+import flask_validation_extended
+
+HEAVY_MODULES = ("flask", "werkzeug", "numpy", "asyncio", "inspect", "re")
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def loaded_modules(statement):
+    output = run_python("-c", (
+        f"import sys; {statement}; "
+        f"print(' '.join(sys.modules))"
+    )).stdout
+    return {name.split(".")[0] for name in output.split()}
+
+
+class ImportTestCase(unittest.TestCase):
+
+    def test_lazy_modules(self):
+        for statement in [
+            "import flask_validation_extended",
+            "import flask_validation_extended.core",
+            "from flask_validation_extended import Json, Min, List, validate",
+        ]:
+            modules = loaded_modules(statement)
+            for module in HEAVY_MODULES:
+                self.assertNotIn(module, modules, statement)
+
+        modules = loaded_modules(
+            "from flask_validation_extended import Validator"
+        )
+        self.assertIn("flask", modules)
+        # numpy_threshold가 주어진 경우에만 import
+        self.assertNotIn("numpy", modules)
+
+    def test_importtime(self):
+        stderr = run_python(
+            "-X", "importtime", "-c", "import flask_validation_extended"
+        ).stderr
+        cumulative = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative_us, name = line.split("|")
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+        # Flask 등을 포함한 기존 import 비용은 300ms 이상
+        self.assertLess(cumulative["flask_validation_extended"], 50000)
+
+    def test_lazy_attributes(self):
+        from flask_validation_extended.vaildator import Validator
+        from flask_validation_extended.exceptions import InvalidRule
+        self.assertIs(flask_validation_extended.Validator, Validator)
+        self.assertIs(flask_validation_extended.InvalidRule, InvalidRule)
+        self.assertIn("Validator", dir(flask_validation_extended))
+        self.assertIn("validate_many", flask_validation_extended.__all__)
+        with self.assertRaises(AttributeError):
+            flask_validation_extended.NotExists
+
+
+if __name__ == '__main__':
+    unittest.main()
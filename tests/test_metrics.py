@@ -0,0 +1,289 @@
+import sys
+import uuid
+import unittest
+import subprocess
+from unittest import mock
+from flask import Flask, Blueprint, request
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Route, Query, Json
+from flask_validation_extended.rules import MinLen, Min, Decimal
+from flask_validation_extended.instrument import ValidationEvent
+from flask_validation_extended.metrics import (
+    ValidationMetrics, FailureTracker, _statsd_name
+)
+
+
+def view_key(view):
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+class InstrumentTestCase(unittest.TestCase):
+
+    options = {}
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        self.params = []
+        self.rules = []
+
+        @app.route("/users/<int:id>", methods=["POST"])
+        @Validator(
+            on_param_validated=self.params.append,
+            on_rule_evaluated=self.rules.append,
+            **self.options
+        )
+        def update(
+                id=Route(int),
+                username=Json(str, rules=[MinLen(3), MinLen(5)]),
+                price=Query(str, rules=[Decimal(), Min(0)], convert=True)
+        ):
+            return {"id": id}
+
+        self.view = view_key(update)
+        self.client = app.test_client()
+
+    def test_events(self):
+        res = self.client.post("/users/1?price=1.5", json={"username": "imiml"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [(e.view, e.source, e.field, e.rule, e.valid) for e in self.params],
+            [
+                (self.view, "Route", "id", None, True),
+                (self.view, "Json", "username", None, True),
+                (self.view, "Query", "price", None, True),
+            ]
+        )
+        self.assertEqual(
+            [(e.field, e.rule, e.valid) for e in self.rules],
+            [
+                ("username", "MinLen", True), ("username", "MinLen", True),
+                ("price", "Decimal", True), ("price", "Min", True),
+            ]
+        )
+        for event in self.params + self.rules:
+            self.assertIsInstance(event.elapsed_ns, int)
+            self.assertGreaterEqual(event.elapsed_ns, 0)
+
+    def test_failed_events(self):
+        res = self.client.post("/users/1?price=a", json={"username": "iml"})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            [(e.field, e.valid) for e in self.params],
+            [("id", True), ("username", False)]
+        )
+        self.assertEqual(
+            [(e.rule, e.valid) for e in self.rules],
+            [("MinLen", True), ("MinLen", False)]
+        )
+
+
+class CodegenInstrumentTestCase(InstrumentTestCase):
+
+    options = {"codegen": True}
+
+
+class CollectInstrumentTestCase(InstrumentTestCase):
+
+    options = {"collect_errors": True}
+
+    def test_failed_events(self):
+        res = self.client.post("/users/1?price=a", json={"username": "iml"})
+        self.assertEqual(len(res.json["error"]), 2)
+        self.assertEqual(
+            [(e.field, e.valid) for e in self.params],
+            [("id", True), ("username", False), ("price", False)]
+        )
+        self.assertEqual(
+            [(e.rule, e.valid) for e in self.rules],
+            [("MinLen", True), ("MinLen", False), ("Decimal", False)]
+        )
+
+
+class ValidationMetricsTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.metrics = ValidationMetrics(buckets=(0.000001, 0.001))
+        for elapsed_ns, valid in [(500, True), (2000, True), (5000, False)]:
+            self.metrics.on_param_validated(
+                ValidationEvent("view", "Json", "name", None, elapsed_ns, valid)
+            )
+        self.metrics.on_rule_evaluated(
+            ValidationEvent("view", "Json", "name", "Regex", 10 ** 7, True)
+        )
+
+    def test_prometheus(self):
+        text = self.metrics.prometheus()
+        labels = 'view="view",source="Json",field="name",valid="true"'
+        for line in [
+            "# TYPE flask_validation_param_duration_seconds histogram",
+            f'flask_validation_param_duration_seconds_bucket{{{labels},le="1e-06"}} 1',
+            f'flask_validation_param_duration_seconds_bucket{{{labels},le="0.001"}} 2',
+            f'flask_validation_param_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            f"flask_validation_param_duration_seconds_sum{{{labels}}} 2.5e-06",
+            f"flask_validation_param_duration_seconds_count{{{labels}}} 2",
+            'flask_validation_rule_duration_seconds_bucket{view="view",'
+            'source="Json",field="name",rule="Regex",valid="true",le="0.001"} 0',
+        ]:
+            self.assertIn(line, text.splitlines())
+
+    def test_statsd(self):
+        lines = self.metrics.statsd_lines()
+        self.assertIn("flask_validation.param.view.Json.name.valid.count:2|c", lines)
+        self.assertIn("flask_validation.param.view.Json.name.valid.mean:0.001250|g", lines)
+        self.assertIn("flask_validation.rule.view.Json.name.Regex.valid.count:1|c", lines)
+        self.assertEqual(len(lines), 6)
+        # flushed
+        self.assertEqual(self.metrics.statsd_lines(), [])
+
+    def test_hooks(self):
+        app = Flask(__name__)
+        metrics = ValidationMetrics()
+
+        @app.route("/")
+        @Validator(**metrics.hooks())
+        def index(page=Query(int, rules=Min(1))):
+            return "ok"
+
+        client = app.test_client()
+        client.get("/?page=1")
+        client.get("/?page=0")
+        self.assertIn(
+            f"flask_validation.rule.{_statsd_name(view_key(index))}"
+            f".Query.page.Min.invalid.count:1|c",
+            metrics.statsd_lines()
+        )
+
+
+class FailureTrackerTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        self.tracker = FailureTracker(key="X-Api-Key", max_failures=2)
+        self.body_parsed = []
+
+        @app.after_request
+        def check_body(response):
+            self.body_parsed.append(
+                request._cached_json != (Ellipsis, Ellipsis)
+            )
+            return response
+
+        @app.route("/users/<int:id>", methods=["POST"])
+        @Validator(failure_tracker=self.tracker)
+        def update(
+                id=Route(int),
+                username=Json(str, rules=MinLen(5)),
+                age=Json(int, rules=Min(18))
+        ):
+            return {"id": id}
+
+        self.view = view_key(update)
+        self.app = app
+        self.client = app.test_client()
+
+    def _post(self, body, key="client-a"):
+        return self.client.post(
+            "/users/1", json=body, headers={"X-Api-Key": key}
+        )
+
+    def test_failure_counters(self):
+        self._post({"username": "iml", "age": 20})
+        self._post({"username": "imiml", "age": 1}, key="client-b")
+        self._post({"username": "imiml", "age": 20}, key="client-c")
+        view = self.view
+        self.assertEqual(self.tracker.failures(), {
+            (view, None): 2, (view, "id"): 0,
+            (view, "username"): 1, (view, "age"): 1,
+        })
+        self.assertEqual(self.tracker.failure_rate("client-a"), 1)
+        self.assertEqual(self.tracker.failure_rate("client-c"), 0)
+        self.assertIn(
+            f'flask_validation_failures_total{{view="{view}",field="age"}} 1',
+            self.tracker.prometheus()
+        )
+
+    def test_same_view_name(self):
+        admin = Blueprint("admin", __name__, url_prefix="/admin")
+
+        @admin.route("/users/<int:id>", methods=["POST"])
+        @Validator(failure_tracker=self.tracker)
+        def update(id=Route(int), age=Json(int)):
+            return {"id": id}
+
+        self.app.register_blueprint(admin)
+        other = view_key(update)
+        self.assertNotEqual(other, self.view)
+        self.client.post(
+            "/admin/users/1", json={"age": "1"}, headers={"X-Api-Key": "a"}
+        )
+        failures = self.tracker.failures()
+        self.assertEqual(failures[(other, None)], 1)
+        self.assertEqual(failures[(other, "age")], 1)
+        self.assertEqual(failures[(self.view, None)], 0)
+
+    def test_fast_reject(self):
+        for _ in range(2):
+            self.assertEqual(self._post({"username": "iml"}).status_code, 400)
+        self.body_parsed.clear()
+
+        res = self._post({"username": "imiml", "age": 20})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json["error"], "Too many invalid requests.")
+        self.assertEqual(self.body_parsed, [False])
+        # rejected requests are not counted
+        self.assertEqual(self.tracker.failures()[(self.view, None)], 2)
+
+        res = self._post({"username": "imiml", "age": 20}, key="client-b")
+        self.assertEqual(res.status_code, 200)
+
+    def test_window(self):
+        with mock.patch("flask_validation_extended.metrics.time") as now:
+            now.return_value = 1000.0
+            self.tracker.record_failure("update", "client-a")
+            self.tracker.record_failure("update", "client-a")
+            self.assertTrue(self.tracker.is_blocked("client-a"))
+            now.return_value = 1055.0
+            self.assertEqual(self.tracker.failure_rate("client-a"), 2)
+            now.return_value = 1061.0
+            self.assertEqual(self.tracker.failure_rate("client-a"), 0)
+            self.assertFalse(self.tracker.is_blocked("client-a"))
+        self.assertFalse(self.tracker.is_blocked(None))
+
+    def test_shared_memory(self):
+        name = f"fve_test_{uuid.uuid4().hex[:8]}"
+        first = FailureTracker(shared_name=name, max_failures=1)
+        second = FailureTracker(shared_name=name, max_failures=1)
+        try:
+            first.record_failure("update", "client-a")
+            self.assertTrue(second.is_blocked("client-a"))
+        finally:
+            second.close()
+            first.close()
+            first.unlink()
+
+    def test_shared_memory_processes(self):
+        # 먼저 종료된 worker가 세그먼트를 unlink하지 않아야 함
+        name = f"fve_test_{uuid.uuid4().hex[:8]}"
+        attach = (
+            "from flask_validation_extended.metrics import FailureTracker; "
+            f"tracker = FailureTracker(shared_name={name!r}, max_failures=1); "
+        )
+        try:
+            for statement in (
+                "tracker.record_failure('update', 'client-a')",
+                "print(tracker.is_blocked('client-a'))",
+            ):
+                result = subprocess.run(
+                    [sys.executable, "-c", attach + statement + "; tracker.close()"],
+                    capture_output=True, text=True, check=True
+                )
+                self.assertNotIn("leaked", result.stderr)
+            self.assertEqual(result.stdout.strip(), "True")
+        finally:
+            tracker = FailureTracker(shared_name=name)
+            tracker.close()
+            tracker.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+import io
+import unittest
+from flask import Flask, Request
+from werkzeug.datastructures import FileStorage
+from werkzeug.test import encode_multipart
+from flask_validation_extended import Validator
+from flask_validation_extended.params import File, Form
+from flask_validation_extended.rules import (
+    Ext, ContentType, MagicBytes, MaxFileCount, MinFileCount,
+    MaxFileSize, MaxTotalFileSize
+)
+from flask_validation_extended.core import compile_params
+from flask_validation_extended.multipart import FileLimits, GuardedFormDataParser
+from flask_validation_extended.streaming import StreamAbort
+from flask_validation_extended.exceptions import InvalidRuleParameter
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 92
+
+
+class RecordingRequest(Request):
+    """Records the files spooled by the form parser."""
+
+    spooled = []
+
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        stream = io.BytesIO()
+        self.spooled.append((filename, stream))
+        return stream
+
+
+class MultipartTestCase(unittest.TestCase):
+
+    options = {}
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        app.request_class = RecordingRequest
+        RecordingRequest.spooled = []
+
+        @app.route("/upload", methods=["POST"])
+        @Validator(**self.options)
+        def upload(
+                title=Form(str),
+                images=File(rules=[
+                    Ext([".png"]), ContentType("image/*"), MagicBytes("png"),
+                    MaxFileSize(200), MaxTotalFileSize(300),
+                    MaxFileCount(3), MinFileCount(1)
+                ])
+        ):
+            return {
+                "title": title,
+                "images": [image.read() == PNG for image in images]
+            }
+
+        self.client = app.test_client()
+
+    def _post(self, *files, title="cat"):
+        return self.client.post("/upload", data={
+            "title": title,
+            "images": [
+                (io.BytesIO(data), filename, content_type)
+                for filename, data, content_type in files
+            ],
+        }, content_type="multipart/form-data")
+
+    def _error(self, res):
+        self.assertEqual(res.status_code, 400)
+        return res.json["error"]
+
+    def test_valid(self):
+        res = self._post(
+            ("a.png", PNG, "image/png"), ("b.png", PNG, "image/png")
+        )
+        self.assertEqual(res.json, {"title": "cat", "images": [True, True]})
+
+    def test_aborted_on_part_start(self):
+        res = self._post(
+            ("a.exe", PNG, "image/png"), ("b.png", PNG, "image/png")
+        )
+        self.assertEqual(
+            self._error(res), "Parameter <images>: is not matched extension: ['.png']"
+        )
+        # the next file is never spooled
+        self.assertEqual(
+            [filename for filename, _ in RecordingRequest.spooled], ["a.exe"]
+        )
+
+        res = self._post(("a.png", PNG, "text/plain"))
+        self.assertEqual(
+            self._error(res),
+            "Parameter <images>: is not matched content type: ['image/*']"
+        )
+
+        res = self._post(*[("a.png", PNG, "image/png")] * 4)
+        self.assertEqual(
+            self._error(res), "Parameter <images>: File Count must smaller than 3."
+        )
+
+    def test_aborted_on_size(self):
+        RecordingRequest.spooled = []
+        res = self._post(("a.png", PNG * 100, "image/png"))
+        self.assertEqual(
+            self._error(res), "Parameter <images>: File size must be at most 200 bytes."
+        )
+        (_, stream), = RecordingRequest.spooled
+        self.assertLess(len(stream.getvalue()), 10000)
+
+        res = self._post(*[("a.png", PNG * 2, "image/png")] * 2)
+        self.assertEqual(
+            self._error(res),
+            "Parameter <images>: Total file size must be at most 300 bytes."
+        )
+
+    def test_magic_bytes(self):
+        for data in [b"GIF89a" + b"\x00" * 50, b"\x89P"]:
+            res = self._post(("a.png", data, "image/png"))
+            self.assertEqual(
+                self._error(res),
+                "Parameter <images>: is not matched file signature: ['png']"
+            )
+
+    def test_no_file(self):
+        res = self._post(("", b"", "application/octet-stream"))
+        self.assertEqual(
+            self._error(res), "Required [File] parameter, 'images' not given."
+        )
+
+
+class CodegenMultipartTestCase(MultipartTestCase):
+
+    options = {"codegen": True}
+
+
+class CollectMultipartTestCase(unittest.TestCase):
+
+    def test_collect_errors(self):
+        app = Flask(__name__)
+
+        @app.route("/upload", methods=["POST"])
+        @Validator(collect_errors=True)
+        def upload(images=File(rules=MaxFileSize(10))):
+            return "ok"
+
+        res = app.test_client().post("/upload", data={
+            "images": (io.BytesIO(PNG), "a.png"),
+        }, content_type="multipart/form-data")
+        self.assertEqual(res.json["error"], [{
+            "source": "File", "field": "images", "check": "MaxFileSize",
+            "message": "Parameter <images>: File size must be at most 10 bytes."
+        }])
+
+
+class FileRuleTestCase(unittest.TestCase):
+    """Rules on already parsed files."""
+
+    def _files(self, *datas, content_type="image/png"):
+        return [
+            FileStorage(io.BytesIO(data), "a.png", content_type=content_type)
+            for data in datas
+        ]
+
+    def test_rules(self):
+        files = self._files(PNG, PNG)
+        self.assertTrue(MaxFileSize(100).is_valid(files))
+        self.assertFalse(MaxFileSize(99).is_valid(files))
+        self.assertTrue(MaxTotalFileSize(200).is_valid(files))
+        self.assertFalse(MaxTotalFileSize(199).is_valid(files))
+        self.assertTrue(MagicBytes(["gif", "png"]).is_valid(files))
+        self.assertTrue(MagicBytes(b"\x89PNG").is_valid(files))
+        self.assertFalse(MagicBytes("pdf").is_valid(files))
+        self.assertTrue(ContentType(["image/png"]).is_valid(files))
+        self.assertFalse(
+            ContentType("image/*").is_valid(self._files(PNG, content_type="text/plain"))
+        )
+        # the streams are not moved
+        self.assertEqual(files[0].read(), PNG)
+
+        for signatures in [[], "exe", 1, b""]:
+            with self.assertRaises(InvalidRuleParameter):
+                MagicBytes(signatures)
+        for content_type in [1, [None]]:
+            with self.assertRaises(InvalidRuleParameter):
+                ContentType(content_type)
+        with self.assertRaises(InvalidRuleParameter):
+            MaxFileSize("1")
+
+
+class RequestBudgetTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        app.request_class = RecordingRequest
+        RecordingRequest.spooled = []
+
+        @app.route("/upload", methods=["POST"])
+        @Validator()
+        def upload(
+                avatar=File(optional=True),
+                images=File(rules=MaxTotalFileSize(300), optional=True)
+        ):
+            return {"count": len(avatar or []) + len(images or [])}
+
+        self.client = app.test_client()
+
+    def _post(self, **files):
+        return self.client.post("/upload", data={
+            name: [(io.BytesIO(data), f"{name}.png") for data in parts]
+            for name, parts in files.items()
+        }, content_type="multipart/form-data")
+
+    def test_request_budget(self):
+        res = self._post(avatar=[PNG], images=[PNG * 2])
+        self.assertEqual(res.json, {"count": 2})
+
+        # 다른 param의 파일도 요청 전체의 예산에 포함
+        res = self._post(avatar=[PNG * 2], images=[PNG * 2])
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"],
+            "Parameter <images>: Total file size must be at most 300 bytes."
+        )
+        res = self._post(avatar=[PNG * 100])
+        self.assertEqual(res.status_code, 400)
+        self.assertLess(len(RecordingRequest.spooled[-1][1].getvalue()), 10000)
+
+
+class GuardedParserTestCase(unittest.TestCase):
+
+    def test_guard_not_bypassed(self):
+        """FormDataParser.parse must dispatch to the guarded multipart parser."""
+        plan = compile_params({"images": File(rules=Ext(".png"))})
+        parser = GuardedFormDataParser(limits={"images": FileLimits(plan[0])})
+        boundary, body = encode_multipart({
+            "images": FileStorage(io.BytesIO(PNG), "a.exe", content_type="image/png")
+        })
+        with self.assertRaises(StreamAbort):
+            parser.parse(
+                io.BytesIO(body), "multipart/form-data", len(body),
+                {"boundary": boundary}
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
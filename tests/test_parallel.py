@@ -0,0 +1,163 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from flask import Flask
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Json
+from flask_validation_extended.rules import Each, Min, MinLen, Regex
+from flask_validation_extended.types import Object, Field, List, Batch
+from flask_validation_extended.batch import validate_many
+from flask_validation_extended.core import compile_params, validate
+from flask_validation_extended.parallel import chunked, ShardedCheck
+
+SCHEMA = Object({
+    "name": Field(str, rules=[MinLen(2), Regex("^[a-z]+$").cached()]),
+    "age": Field(int, rules=Min(0)),
+    "role": Field(str, default="member"),
+})
+
+
+def make_records():
+    records = []
+    for i in range(25):
+        if i % 4 == 1:
+            records.append({"name": "IML", "age": i})
+        elif i % 7 == 3:
+            records.append({"name": "iml"})
+        else:
+            records.append({"name": "iml", "age": i})
+    return records
+
+
+class ShardedValidateManyTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def assertSameResult(self, **kwargs):
+        expected = validate_many(make_records(), SCHEMA, **kwargs)
+        result = validate_many(
+            make_records(), SCHEMA,
+            executor=self.executor, chunk_size=4, **kwargs
+        )
+        self.assertEqual(result, expected)
+        self.assertEqual(result.errors, expected.errors)
+        self.assertEqual(result.total, expected.total)
+        return result
+
+    def test_sharded(self):
+        result = self.assertSameResult()
+        self.assertEqual(result.total, 25)
+        self.assertEqual(result[0], {"name": "iml", "age": 0, "role": "member"})
+        self.assertSameResult(partial=False)
+        for max_errors in range(1, 10):
+            self.assertSameResult(max_errors=max_errors)
+
+    def test_pickle(self):
+        validate_many(make_records(), SCHEMA)
+        schema = pickle.loads(pickle.dumps(SCHEMA))
+        self.assertEqual(
+            validate_many(make_records(), schema).errors,
+            validate_many(make_records(), SCHEMA).errors
+        )
+        rule = pickle.loads(pickle.dumps(Regex("^a").cached(maxsize=16)))
+        self.assertTrue(rule.is_valid("abc"))
+        self.assertEqual(rule.cache_info().maxsize, 16)
+
+    def test_sharded_defaults(self):
+        params = {"items": Json(List(Object(a=int, b=Field(int, default=7))))}
+        plan = compile_params(
+            params, executor=self.executor, executor_threshold=2
+        )
+        self.assertIsInstance(plan[0].transform, ShardedCheck)
+        items = [{"a": i} for i in range(5)]
+        expected = [{"a": i, "b": 7} for i in range(5)]
+        self.assertEqual(
+            validate(plan, {"json": {"items": items}}),
+            ({"items": expected}, None)
+        )
+        self.assertEqual(
+            validate(params, {"json": {"items": [{"a": i} for i in range(5)]}}),
+            ({"items": expected}, None)
+        )
+        inputs, error = validate(
+            plan, {"json": {"items": [{"a": 1}, {"a": 2}, {"a": "3"}]}}
+        )
+        self.assertIsNotNone(error)
+
+    def test_threshold(self):
+        class Recorder:
+            def map(self, *args):
+                raise AssertionError("list of threshold items is sharded")
+
+        plan = compile_params(
+            {"items": Json(List(int))}, executor=Recorder(), executor_threshold=3
+        )
+        self.assertEqual(
+            validate(plan, {"json": {"items": [1, 2, 3]}}),
+            ({"items": [1, 2, 3]}, None)
+        )
+        result = validate_many(
+            make_records()[:4], SCHEMA, executor=Recorder(), chunk_size=4
+        )
+        self.assertEqual(result.total, 4)
+
+    def test_chunked(self):
+        self.assertEqual(
+            chunked([1, 2, 3, 4, 5], 2), [(0, [1, 2]), (2, [3, 4]), (4, [5])]
+        )
+
+
+class ShardedParamTestCase(unittest.TestCase):
+
+    options = {}
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+        @app.route("/scores", methods=["POST"])
+        @Validator(executor=self.executor, executor_threshold=3, **self.options)
+        def scores(
+                scores=Json(List(int), rules=[MinLen(1), Each(Min(0))]),
+                users=Json(Batch(SCHEMA), optional=True)
+        ):
+            return {"scores": scores, "users": users, "errors": users.errors}
+
+        self.app = app
+        self.client = app.test_client()
+
+    def test_sharded(self):
+        step = self.app.view_functions["scores"].validation_plan[0]
+        self.assertIsInstance(step.transform, ShardedCheck)
+
+        res = self.client.post("/scores", json={
+            "scores": list(range(10)), "users": make_records()
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json["scores"], list(range(10)))
+        self.assertEqual(res.json["errors"], validate_many(make_records(), SCHEMA).errors)
+
+        for scores, error in [
+            ([1, 2, 3, 4, -5, 6], "Parameter <scores>: item [4] must be larger than 0."),
+            ([1, 2, 3, 4, "5", 6], "In [Json] Params, 'scores' is not ['List(int)']."),
+            ([], "Parameter <scores>: must be at least 1 elements."),
+        ]:
+            res = self.client.post("/scores", json={"scores": scores})
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.json["error"], error)
+
+
+class CodegenShardedParamTestCase(ShardedParamTestCase):
+
+    options = {"codegen": True}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,18 @@ import unittest
 from flask_validation_extended.exceptions import (
     InvalidAnnotation,
     InvalidDefault,
-    InvalidOptional
+    InvalidOptional,
+    InvalidConvert,
+    InvalidRuleAnnotation,
+    InvalidListStyle,
+    InvalidConvertRule
 )
 from flask_validation_extended.types import All, List, Dict, FileObj
 from flask_validation_extended.params import Route, Query, Form
+from fractions import Fraction
+from flask_validation_extended.rules import (
+    Decimal, Min, MinLen, IsoDatetime, Uuid, IpAddress, Coerce, In, Regex
+)
 
 
 class ParamTestCase(unittest.TestCase):
@@ -38,6 +46,24 @@ class ParamTestCase(unittest.TestCase):
         for target in self.targets:
             self._annotation_valid(target)
 
+    def test_multi_value_annotation(self):
+        """Query, Form List annotation test"""
+        for target in [Query, Form]:
+            for item in [int, str, float, bool, All]:
+                target(List(item))
+            target(List(int), default=[1, 2], style="comma")
+            for annotation in [
+                List(list), List([int, str]), List(List()),
+                Dict(int), [List(int), int]
+            ]:
+                with self.assertRaises(InvalidAnnotation):
+                    target(annotation)
+            with self.assertRaises(InvalidListStyle):
+                target(List(int), style="json")
+
+        with self.assertRaises(InvalidAnnotation):
+            Route(List(int))
+
     def _default_valid(self, target):
         """Route default validation test"""
         types = [int, str, float, bool]
@@ -86,6 +112,36 @@ class ParamTestCase(unittest.TestCase):
                 except InvalidOptional:
                     exception_check = True
                 self.assertTrue(exception_check)
+    def test_convert_valid(self):
+        """Param convert validation test"""
+        for target in self.targets:
+            for flag in [True, False]:
+                target(convert=flag)
+            for flag in [1, "1", None]:
+                with self.assertRaises(InvalidConvert):
+                    target(convert=flag)
+
+            # rules after the conversion are applied to the converted value
+            target(str, rules=[MinLen(1), Decimal(), Min(0)], convert=True)
+            with self.assertRaises(InvalidRuleAnnotation):
+                target(str, rules=[Min(0), Decimal()], convert=True)
+            with self.assertRaises(InvalidRuleAnnotation):
+                target(str, rules=[Decimal(), Min(0)])
+            # ... and checked against the type of the converted value
+            target(str, rules=[IsoDatetime(), In([None])], convert=True)
+            target(str, rules=[Coerce(Fraction), Min(0)], convert=True)
+            for rules in [
+                [IsoDatetime(), MinLen(3)], [Uuid(), Regex("^a")],
+                [IpAddress(4), Min(0)], [Decimal(), MinLen(1)],
+            ]:
+                with self.assertRaises(InvalidRuleAnnotation):
+                    target(str, rules=rules, convert=True)
+
+            # Cached conversion rule can't pass the converted value
+            target(str, rules=IsoDatetime().cached())
+            with self.assertRaises(InvalidConvertRule):
+                target(str, rules=IsoDatetime().cached(), convert=True)
+
 
 if __name__ == '__main__':
     unittest.main()
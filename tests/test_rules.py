@@ -1,17 +1,25 @@
+import decimal
 import unittest
+from uuid import UUID
+from datetime import datetime
+from fractions import Fraction
+from ipaddress import ip_address
 from itertools import combinations
 from flask_validation_extended.exceptions import (
+    InvalidRule,
+    InvalidRuleParameter,
     InvalidAnnotation,
     InvalidDefault,
     InvalidOptional,
     InvalidRuleAnnotation
 )
-from flask_validation_extended.types import All, List, Dict, FileObj
+from flask_validation_extended.types import All, List, Dict, FileObj, Object
 from flask_validation_extended.params import Json, File, Form
 from flask_validation_extended.rules import (
     MinLen, MaxLen, Min, Max, In,
     Number, Strip, IsoDatetime, 
-    Datetime, Email, Regex, Ext
+    Datetime, Email, PhoneNum, Regex, RegexSet, Ext, Each, Cached,
+    AsyncValidationRule, Uuid, IpAddress, Decimal, Coerce
 )
 
 
@@ -166,6 +174,49 @@ class RuleTestCase(unittest.TestCase):
 
         self._validate_rule_annotation(rule.types, rule)
 
+    def test_conversion_rules(self):
+        self.assertEqual(
+            Datetime("%Y-%m-%d").convert("2021-01-02"),
+            datetime(2021, 1, 2)
+        )
+        self.assertEqual(
+            IsoDatetime().convert("2021-01-02T03:04:05"),
+            datetime(2021, 1, 2, 3, 4, 5)
+        )
+
+        uid = "12345678-1234-4678-9234-567812345678"
+        self.assertEqual(Uuid().convert(uid), UUID(uid))
+        self.assertTrue(Uuid(4).is_valid(uid))
+        for case in ["1234", "", uid + "0"]:
+            self.assertFalse(Uuid().is_valid(case))
+        self.assertFalse(Uuid(1).is_valid(uid))
+
+        self.assertEqual(IpAddress().convert("127.0.0.1"), ip_address("127.0.0.1"))
+        self.assertTrue(IpAddress(6).is_valid("::1"))
+        self.assertFalse(IpAddress(4).is_valid("::1"))
+        self.assertFalse(IpAddress().is_valid("256.0.0.1"))
+        with self.assertRaises(InvalidRuleParameter):
+            IpAddress(5)
+
+        self.assertEqual(Decimal().convert("0.10"), decimal.Decimal("0.10"))
+        for case in ["1.2.3", "", "NaN", "Infinity", "1e"]:
+            self.assertFalse(Decimal().is_valid(case))
+
+        rule = Coerce(Fraction)
+        self.assertEqual(rule.convert("1/3"), Fraction(1, 3))
+        for case in ["1/0", "a", None]:
+            self.assertFalse(rule.is_valid(case))
+        self.assertEqual(rule.invalid_str(), "can't be converted by Fraction.")
+        Json(int, rules=rule)
+        Json(str, rules=Coerce(str.upper, types=str))
+        with self.assertRaises(InvalidRuleAnnotation):
+            Json(int, rules=Coerce(str.upper, types=str))
+        with self.assertRaises(InvalidRuleParameter):
+            Coerce(1)
+
+        for rule in [Uuid(), IpAddress(), Decimal()]:
+            self._validate_rule_annotation(rule.types, rule)
+
     def test_email(self):
         rule = Email()
 
@@ -201,6 +252,37 @@ class RuleTestCase(unittest.TestCase):
 
         self._validate_rule_annotation(rule.types, rule)
 
+    def test_phone_num(self):
+        rule = PhoneNum()
+
+        for case in ["010-1234-5678", "+82 010.123.4567", "(010) 123-4567"]:
+            self.assertTrue(rule.is_valid(case))
+        for case in ["01012345678", "010-1234-5678\n", "phone"]:
+            self.assertFalse(rule.is_valid(case))
+
+        self._validate_rule_annotation(rule.types, rule)
+
+    def test_regex_set(self):
+        rule = RegexSet([r'^[0-9]+$', r'^[a-z]+$'])
+
+        for case in ["1", "112346897", "asd"]:
+            self.assertTrue(rule.is_valid(case))
+        for case in ["1111a", "56987_", "A"]:
+            self.assertFalse(rule.is_valid(case))
+
+        # patterns with group references are not merged
+        rule = RegexSet([r'^(a)\1$', r'^(?P<b>b)(?P=b)$'])
+        for case in ["aa", "bb"]:
+            self.assertTrue(rule.is_valid(case))
+        for case in ["a", "ab"]:
+            self.assertFalse(rule.is_valid(case))
+
+        for patterns in [[], "asd", [1], None]:
+            with self.assertRaises(InvalidRuleParameter):
+                RegexSet(patterns)
+
+        self._validate_rule_annotation(rule.types, rule)
+
     def _validate_ext(self, exts, good_cases, bad_cases):
         rule = Ext(exts)
 
@@ -242,6 +324,94 @@ class RuleTestCase(unittest.TestCase):
             ]
         )
 
+    def test_each(self):
+        rule = Each(Min(0), Max(10))
+        self.assertTrue(rule.is_valid([0, 5, 10]))
+        self.assertTrue(rule.is_valid({"a": 1}))
+        self.assertFalse(rule.is_valid([0, 11]))
+        self.assertEqual(
+            rule.invalid_str(),
+            "each item must be larger than 0. must be smaller than 10."
+        )
+        self.assertEqual(len(Each([Min(0), Max(10)]).rules), 2)
+
+        Json(List(int), rules=rule)
+        Json(Dict([int, float]), rules=rule)
+        Json(List(str), rules=Each(MinLen(1), Email()))
+        Json(list, rules=Each(In([1, 2])))
+        for annotation in [
+            int, list, List(str), List([int, str]), All, Object(a=int)
+        ]:
+            with self.assertRaises(InvalidRuleAnnotation):
+                Json(annotation, rules=rule)
+        with self.assertRaises(InvalidRuleAnnotation):
+            Json(Object(a=int), rules=Each(In([1])))
+
+        Json(List(int), default=[1, 5], rules=Each(Max(5)))
+        Form(List(int), default=[], rules=Each(Max(5)))
+        for default in ([99], [1, 99], {"a": 99}):
+            with self.assertRaises(InvalidDefault):
+                Json([List(int), Dict(int)], default=default, rules=Each(Max(5)))
+        for rules in [1, Each(Min(0)), "rule"]:
+            with self.assertRaises(InvalidRule):
+                Each(rules)
+
+    def test_cached(self):
+        rule = Cached(Datetime("%Y-%m-%d"), maxsize=2)
+        self.assertIs(rule.types, str)
+        self.assertEqual(rule.invalid_str(), "must be a Datetime Format: %Y-%m-%d")
+
+        for case in ["2021-01-01", "2021-01-01", "2021-13-01", "2021-01-01"]:
+            self.assertEqual(rule.is_valid(case), case == "2021-01-01")
+        info = rule.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 2))
+
+        rule.is_valid("2021-01-02")
+        self.assertEqual(rule.cache_info().currsize, 2)
+        rule.cache_clear()
+        self.assertEqual(rule.cache_info().currsize, 0)
+
+        # typed cache and unhashable data
+        rule = In([1, [1, 2]]).cached()
+        self.assertTrue(rule.is_valid(1))
+        self.assertFalse(rule.is_valid(1.5))
+        self.assertTrue(rule.is_valid([1, 2]))
+        self.assertEqual(rule.cache_info().misses, 2)
+
+        Json(str, rules=Cached(Email()))
+        with self.assertRaises(InvalidRuleAnnotation):
+            Json(int, rules=Cached(Email()))
+
+        class AsyncRule(AsyncValidationRule):
+            async def is_valid(self, data) -> bool:
+                return True
+
+        for rule in [1, AsyncRule()]:
+            with self.assertRaises(InvalidRule):
+                Cached(rule)
+        with self.assertRaises(InvalidRuleParameter):
+            Cached(Email(), maxsize="1")
+
+    def test_slots(self):
+        for obj in [
+            MinLen(1), Min(1), Regex("a"), Each(Min(0)), Email().cached(),
+            Coerce(int), Json(int), Form(List(int)), File(), List(int), Dict(str)
+        ]:
+            self.assertFalse(hasattr(obj, "__dict__"), obj.__class__)
+        self.assertEqual(MinLen.types, (str, list, dict))
+        self.assertIs(MinLen(1).types, MinLen(2).types)
+        self.assertIs(List(int).org_type, list)
+        self.assertEqual(Coerce(int, types=str).types, str)
+
+        # types as a property is still supported in custom rules
+        class Custom(Min):
+            @property
+            def types(self):
+                return int
+        Json(int, rules=Custom(1))
+        with self.assertRaises(InvalidRuleAnnotation):
+            Json(float, rules=Custom(1))
+
     def test_successed_rule_annotation(self):
         Json(List(All), rules=MinLen(5))
         Json(list, rules=MinLen(5))
@@ -0,0 +1,114 @@
+import io
+import json
+import unittest
+from flask import Flask
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Json, Query
+from flask_validation_extended.rules import MaxLen, MinLen
+from flask_validation_extended.types import List, Dict
+from flask_validation_extended.plans import compile_plan
+from flask_validation_extended.streaming import (
+    StreamField, StreamAbort, extract, ijson
+)
+
+
+class ChunkedStream:
+    """Returns at most 16 bytes per read, counting the reads."""
+
+    def __init__(self, data):
+        self.buffer = io.BytesIO(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        if size == 0:
+            return b""
+        self.reads += 1
+        return self.buffer.read(16)
+
+
+@unittest.skipIf(ijson is None, "ijson is not installed")
+class StreamingTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+
+        def ingest(
+                samples=Json(List(int), rules=[MinLen(1), MaxLen(5)]),
+                tags=Json(Dict(str), optional=True),
+                nested=Json([List(List(int)), str], optional=True),
+                page=Query(int, default=1)
+        ):
+            return {
+                "samples": samples, "tags": tags,
+                "nested": nested, "page": page
+            }
+
+        self.view = Validator(stream_json=True)(ingest)
+        app.add_url_rule("/ingest", "ingest", self.view, methods=["POST"])
+        self.client = app.test_client()
+        self.fields = {
+            step.key: StreamField(step)
+            for step in compile_plan(ingest) if step.source is Json
+        }
+
+    def test_extract(self):
+        res = self.client.post("/ingest", json={
+            "ignored": {"a": [1, 2, {"b": None}]},
+            "samples": [1, 2, 3],
+            "nested": [[1], [2, 3]],
+            "tags": {"a": "b"},
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json, {
+            "samples": [1, 2, 3], "tags": {"a": "b"},
+            "nested": [[1], [2, 3]], "page": 1
+        })
+
+    def test_type_abort(self):
+        cases = [
+            ({"samples": [1, "2"]}, "samples", "['List(int)']"),
+            ({"samples": {"a": 1}}, "samples", "['List(int)']"),
+            ({"samples": [1], "tags": {"a": 1}}, "tags", "['Dict(str)']"),
+            (
+                {"samples": [1], "nested": [[1], 2]},
+                "nested", "['List(List(int))', \"<class 'str'>\"]"
+            ),
+        ]
+        for body, name, annotation in cases:
+            res = self.client.post("/ingest", json=body)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(
+                res.json["error"],
+                f"In [Json] Params, '{name}' is not {annotation}."
+            )
+
+    def test_length_abort(self):
+        res = self.client.post("/ingest", json={"samples": list(range(10))})
+        self.assertEqual(
+            res.json["error"],
+            "Parameter <samples>: must be a maximum of 5 elements."
+        )
+        res = self.client.post("/ingest", json={"samples": []})
+        self.assertEqual(
+            res.json["error"],
+            "Parameter <samples>: must be at least 1 elements."
+        )
+
+    def test_abort_before_buffering(self):
+        body = json.dumps({"samples": ["x"] + list(range(10000))}).encode()
+        stream = ChunkedStream(body)
+        with self.assertRaises(StreamAbort):
+            extract(stream, self.fields)
+        self.assertLess(stream.reads * 16, 1024)
+
+    def test_invalid_json(self):
+        res = self.client.post(
+            "/ingest", data='{"samples": [1,', content_type="application/json"
+        )
+        self.assertEqual(
+            res.json["error"], "Required [Json] parameter, 'samples' not given."
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
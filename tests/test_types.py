@@ -1,8 +1,13 @@
 import unittest
 from itertools import combinations
-from flask_validation_extended.types import List, Dict, All, type_check
+from flask_validation_extended.types import (
+    List, Dict, Object, Field, All, type_check, compile_type_check,
+    compile_fill_defaults
+)
+from flask_validation_extended.rules import MinLen, Min, AsyncValidationRule
 from flask_validation_extended.exceptions import (
-    InvalidCustomTypeArgument
+    InvalidCustomTypeArgument, InvalidDefault, InvalidRuleAnnotation,
+    InvalidRule
 )
 
 class TypeTestCase(unittest.TestCase):
@@ -75,6 +80,99 @@ class TypeTestCase(unittest.TestCase):
         for target in self.targets:
             self._test_type(target)
 
+    def test_type_check(self):
+        """compiled type checker test"""
+        cases = [
+            (int, 1, True), (int, "1", False), (int, True, True),
+            ([int, str], "1", True), ([int, str], 1.2, False),
+            (All, {1, 2}, True), ([All], None, True),
+            (List(), [1, "a"], True), (List(), {}, False),
+            (List(int), [1, 2, 3], True), (List(int), [1, "2"], False),
+            (List([int, str]), [1, "2"], True),
+            (List(List(int)), [[1], [2, 3]], True),
+            (List(List(int)), [[1], 2], False),
+            (List([int, List(int)]), [1, [1, 2], 2], True),
+            (List(Dict(str)), [{"name": "IML"}], True),
+            (List(Dict(str)), [{"name": 1}], False),
+            (Dict(int), {"a": 1}, True), (Dict(int), [1], False),
+            (Dict(List(int)), {"a": [1, 2]}, True),
+            (Dict(List(int)), {"a": [1, "2"]}, False),
+        ]
+        for annotation, data, result in cases:
+            self.assertEqual(type_check(data, annotation), result)
+            self.assertEqual(compile_type_check(annotation)(data), result)
+
+    def test_checker_cached(self):
+        annotation = List(Dict(int))
+        self.assertIs(
+            compile_type_check(annotation), compile_type_check(annotation)
+        )
+
+    def test_object(self):
+        """custom type Object validation test"""
+        user = Object(
+            name=Field(str, rules=MinLen(2)),
+            age=Field(int, optional=True, rules=Min(0)),
+            role=Field(str, default="member"),
+            tags=List(str),
+        )
+        self.assertEqual(str(user), "Object(name, age, role, tags)")
+        self.assertEqual(str(List(user)), "List(Object(name, age, role, tags))")
+
+        data = {"name": "IML", "tags": ["a"]}
+        self.assertTrue(type_check(data, user))
+        # 검사는 데이터를 변경하지 않고, default는 통과 후 채움
+        self.assertNotIn("role", data)
+        compile_fill_defaults(user)(data)
+        self.assertEqual(data["role"], "member")
+
+        cases = [
+            ([], "must be an object."),
+            ({"tags": []}, "field 'name' not given."),
+            ({"name": "I", "tags": []}, "field 'name': must be at least 2 elements."),
+            ({"name": "IML", "tags": [1]}, "field 'tags' is not ['List(str)']."),
+            ({"name": "IML", "age": -1, "tags": []}, "field 'age': must be larger than 0."),
+        ]
+        for data, reason in cases:
+            self.assertFalse(type_check(data, user))
+            self.assertEqual(user.explain(data), reason)
+
+        nested = List(Object({"user-info": user}))
+        self.assertTrue(type_check([{"user-info": {"name": "IML", "tags": []}}], nested))
+        self.assertFalse(type_check([{"user-info": {"name": "IML"}}], nested))
+
+        data = [{"user-info": {"name": "IML", "tags": []}}]
+        compile_fill_defaults(nested)(data)
+        self.assertEqual(data[0]["user-info"]["role"], "member")
+        self.assertIsNone(compile_fill_defaults(List(Object(name=str))))
+
+    def test_object_union_defaults(self):
+        annotation = [Object(b=Field(int, default=5), a=int), Object(a=str)]
+        data = {"a": "x"}
+        self.assertTrue(type_check(data, annotation))
+        compile_fill_defaults(annotation)(data)
+        # 실패한 어노테이션의 default는 채우지 않음
+        self.assertEqual(data, {"a": "x"})
+
+        data = {"a": 1}
+        compile_fill_defaults(annotation)(data)
+        self.assertEqual(data, {"a": 1, "b": 5})
+
+    def test_invalid_object(self):
+        for args, kwargs in [((1,), {}), ((), {"name": 1}), ((), {"name": set})]:
+            with self.assertRaises(InvalidCustomTypeArgument):
+                Object(*args, **kwargs)
+        with self.assertRaises(InvalidDefault):
+            Field(int, default="1")
+        with self.assertRaises(InvalidRuleAnnotation):
+            Field(int, rules=MinLen(1))
+
+        class Unique(AsyncValidationRule):
+            async def is_valid(self, data):
+                return False
+        with self.assertRaises(InvalidRule):
+            Field(str, rules=[MinLen(1), Unique()])
+
 
 if __name__ == '__main__':
     unittest.main()
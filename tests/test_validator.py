@@ -0,0 +1,530 @@
+import io
+import json
+import asyncio
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+from flask import Flask, request
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Route, Query, Json, Header, Form
+from flask_validation_extended.rules import (
+    MinLen, MaxLen, Min, Max, Regex, Each, AsyncValidationRule,
+    IsoDatetime, Decimal, Uuid
+)
+from flask_validation_extended.types import List, Dict, Object, Field
+from flask_validation_extended import decoders
+from flask_validation_extended.decoders import resolve_json_decoder
+from flask_validation_extended.exceptions import (
+    InvalidParameter, InvalidAsyncRule, InvalidMaxErrors
+)
+
+try:
+    import asgiref
+except ImportError:
+    asgiref = None
+
+
+class ValidatorTestCase(unittest.TestCase):
+
+    options = {}
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+
+        @app.route("/users/<int:id>", methods=["POST"])
+        @Validator(**self.options)
+        def update(
+                id=Route(int),
+                username=Json(str, rules=MinLen(5)),
+                age=Json(int, rules=Min(18)),
+                nicknames=Json(List(str), optional=True),
+                token=Header('X-Token', str),
+                is_admin=Query(bool, default=False)
+        ):
+            return {
+                "id": id, "username": username, "age": age,
+                "nicknames": nicknames, "token": token,
+                "is_admin": is_admin
+            }
+
+        @app.route("/search", methods=["POST"])
+        @Validator(**self.options)
+        def search(keyword=Query(str)):
+            return {
+                "keyword": keyword,
+                "form_parsed": "form" in request.__dict__,
+                "json_parsed": request._cached_json != (Ellipsis, Ellipsis)
+            }
+
+        @app.route("/profiles", methods=["POST"])
+        @Validator(**self.options)
+        def profile(
+                user=Json(Object(
+                    name=Field(str, rules=MinLen(2)),
+                    role=Field(str, default="member")
+                ))
+        ):
+            return user
+
+        @app.route("/scores", methods=["POST"])
+        @Validator(**self.options)
+        def scores(
+                scores=Json(List(int), rules=[MinLen(1), Each(Min(0), Max(100))]),
+                labels=Json(Dict(str), rules=Each(MinLen(1)), optional=True)
+        ):
+            return {"scores": scores, "labels": labels}
+
+        @app.route("/events", methods=["POST"])
+        @Validator(**self.options)
+        def event(
+                start=Json(str, rules=IsoDatetime(), convert=True),
+                price=Query(str, rules=[Decimal(), Min(0)], convert=True),
+                key=Json(str, rules=Uuid(), optional=True)
+        ):
+            return {
+                "year": start.year, "price": str(price * 2),
+                "key": key
+            }
+
+        @app.route("/items", methods=["POST"])
+        @Validator(**self.options)
+        def items(
+                ids=Query(List(int), rules=[MaxLen(3), Each(Min(1))]),
+                flags=Query(List(bool), style="comma", default=[False]),
+                tags=Query(List(str), style="brackets", optional=True),
+                names=Form(List(), optional=True)
+        ):
+            return {"ids": ids, "flags": flags, "tags": tags, "names": names}
+
+        self.update = update
+        self.client = app.test_client()
+
+    def _post(self, query="", json=None, headers=None):
+        return self.client.post(
+            "/users/1" + query,
+            json={"username": "IMIML", "age": 20} if json is None else json,
+            headers={"X-Token": "secret"} if headers is None else headers
+        )
+
+    def test_valid_request(self):
+        res = self._post(query="?is_admin=true")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json, {
+            "id": 1, "username": "IMIML", "age": 20,
+            "nicknames": None, "token": "secret",
+            "is_admin": True
+        })
+
+    def test_default(self):
+        res = self._post()
+        self.assertEqual(res.json["is_admin"], False)
+
+    def test_missing(self):
+        res = self._post(json={"username": "IMIML"})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"], "Required [Json] parameter, 'age' not given."
+        )
+        res = self._post(headers={})
+        self.assertEqual(
+            res.json["error"],
+            "Required [Header] parameter, Header 'X-Token' not given."
+        )
+
+    def test_convert_failed(self):
+        res = self._post(query="?is_admin=yes")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"],
+            "In [Query] Params, 'is_admin' can't be converted to <class 'bool'>."
+        )
+
+    def test_type_failed(self):
+        res = self._post(json={
+            "username": "IMIML", "age": 20, "nicknames": [1, 2]
+        })
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"],
+            "In [Json] Params, 'nicknames' is not ['List(str)']."
+        )
+
+    def test_rule_failed(self):
+        res = self._post(json={"username": "IML", "age": 20})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"],
+            "Parameter <username>: must be at least 5 elements."
+        )
+
+    def test_object(self):
+        res = self.client.post("/profiles", json={"user": {"name": "IML"}})
+        self.assertEqual(res.json, {"name": "IML", "role": "member"})
+
+        res = self.client.post("/profiles", json={"user": {"name": "I"}})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"],
+            "In [Json] Params, 'user' is not ['Object(name, role)']. "
+            "(field 'name': must be at least 2 elements.)"
+        )
+
+    def test_each(self):
+        res = self.client.post("/scores", json={
+            "scores": [0, 50, 100], "labels": {"a": "A"}
+        })
+        self.assertEqual(res.json, {
+            "scores": [0, 50, 100], "labels": {"a": "A"}
+        })
+
+        cases = [
+            ({"scores": [0, 101]}, "Parameter <scores>: item [1] must be smaller than 100."),
+            ({"scores": [-1]}, "Parameter <scores>: item [0] must be larger than 0."),
+            ({"scores": [1, "2"]}, "In [Json] Params, 'scores' is not ['List(int)']."),
+            ({"scores": []}, "Parameter <scores>: must be at least 1 elements."),
+            (
+                {"scores": [1], "labels": {"a": ""}},
+                "Parameter <labels>: item ['a'] must be at least 1 elements."
+            ),
+        ]
+        for body, error in cases:
+            res = self.client.post("/scores", json=body)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.json["error"], error)
+
+    def test_convert(self):
+        uid = "12345678-1234-4678-9234-567812345678"
+        res = self.client.post(
+            "/events?price=1.10",
+            json={"start": "2021-01-02T03:04:05", "key": uid}
+        )
+        self.assertEqual(res.json, {"year": 2021, "price": "2.20", "key": uid})
+
+        cases = [
+            ("?price=1", {"start": "2021"}, "Parameter <start>: must be a ISO Datetime Format."),
+            ("?price=a", {"start": "2021-01-02"}, "Parameter <price>: must be a decimal number string."),
+            ("?price=-1", {"start": "2021-01-02"}, "Parameter <price>: must be larger than 0."),
+        ]
+        for query, body, error in cases:
+            res = self.client.post("/events" + query, json=body)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.json["error"], error)
+
+    def test_multi_value(self):
+        res = self.client.post(
+            "/items?ids=1&ids=2&flags=true,FALSE&tags[]=a&tags[]=b",
+            data={"names": ["x", "y"]}
+        )
+        self.assertEqual(res.json, {
+            "ids": [1, 2], "flags": [True, False],
+            "tags": ["a", "b"], "names": ["x", "y"]
+        })
+        res = self.client.post("/items?ids=3")
+        self.assertEqual(res.json, {
+            "ids": [3], "flags": [False], "tags": None, "names": None
+        })
+        res = self.client.post("/items?ids=3&flags=")
+        self.assertEqual(res.json["flags"], [])
+
+        cases = [
+            ("", "Required [Query] parameter, 'ids' not given."),
+            ("?ids=1&ids=a", "In [Query] Params, 'ids' can't be converted to List(int)."),
+            ("?ids=1&ids=0", "Parameter <ids>: item [1] must be larger than 1."),
+            ("?ids=1&ids=2&ids=3&ids=4", "Parameter <ids>: must be a maximum of 3 elements."),
+            ("?ids=1&flags=true,no", "In [Query] Params, 'flags' can't be converted to List(bool)."),
+        ]
+        for query, error in cases:
+            res = self.client.post("/items" + query)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.json["error"], error)
+
+    def test_plan_compiled(self):
+        plan = self.update.validation_plan
+        self.assertIsInstance(plan, tuple)
+        self.assertEqual(
+            [step.name for step in plan],
+            ["id", "username", "age", "nicknames", "token", "is_admin"]
+        )
+        self.assertEqual(plan[4].key, "X-Token")
+
+    def test_lazy_sources(self):
+        res = self.client.post(
+            "/search?keyword=iml", data={"field": "value"}
+        )
+        self.assertEqual(res.json, {
+            "keyword": "iml", "form_parsed": False, "json_parsed": False
+        })
+
+    def test_header_case_insensitive(self):
+        res = self._post(headers={"x-token": "secret"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json["token"], "secret")
+        self.assertEqual(self.update.validation_plan[4].lookup_key, "HTTP_X_TOKEN")
+
+    def test_environ_headers(self):
+        app = Flask(__name__)
+
+        @app.route("/upload", methods=["POST"])
+        @Validator(**self.options)
+        def upload(
+                content_type=Header("content-type", str),
+                length=Header("Content-Length", int, rules=Max(10)),
+                trace=Header("X-Trace-Id", optional=True)
+        ):
+            return {"type": content_type, "length": length, "trace": trace}
+
+        client = app.test_client()
+        res = client.post("/upload", data=b"12345", content_type="text/plain")
+        self.assertEqual(
+            res.json, {"type": "text/plain", "length": 5, "trace": None}
+        )
+        res = client.post(
+            "/upload", data=b"1" * 11, content_type="text/plain",
+            headers={"x-trace-id": "a"}
+        )
+        self.assertEqual(
+            res.json["error"], "Parameter <length>: must be smaller than 10."
+        )
+        self.assertEqual(
+            [step.lookup_key for step in upload.validation_plan],
+            ["CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_X_TRACE_ID"]
+        )
+
+    def test_invalid_parameter(self):
+        for default in [None, 1, "id", int]:
+            def view(id=default):
+                pass
+            with self.assertRaises(InvalidParameter):
+                Validator()(view)
+
+
+class CodegenValidatorTestCase(ValidatorTestCase):
+
+    options = {"codegen": True}
+
+    def test_generated_source(self):
+        source = self.update.validation_source
+        self.assertTrue(source.startswith("def validate(sources):"))
+        self.assertIn("value = int(value)", source)
+        self.assertIn("_rule_1_0.is_valid(value)", source)
+
+    def test_dump_source(self):
+        def view(id=Route(int)):
+            pass
+        with redirect_stderr(io.StringIO()) as stderr:
+            view = Validator(codegen=True, dump_source=True)(view)
+        self.assertEqual(stderr.getvalue().strip(), view.validation_source.strip())
+
+
+class JsonDecoderValidatorTestCase(ValidatorTestCase):
+
+    options = {"json_decoder": "auto"}
+
+
+class JsonDecoderTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        self.decoded = []
+
+        def decoder(data):
+            self.decoded.append(data)
+            return json.loads(data)
+
+        @app.route("/echo", methods=["POST"])
+        @Validator(json_decoder=decoder)
+        def echo(name=Json(str)):
+            return {"name": name, "body": request.get_json()}
+
+        self.client = app.test_client()
+
+    def test_decoded_once(self):
+        res = self.client.post("/echo", json={"name": "iml"})
+        self.assertEqual(res.json, {"name": "iml", "body": {"name": "iml"}})
+        self.assertEqual(len(self.decoded), 1)
+
+    def test_without_cache(self):
+        self.assertTrue(decoders.JSON_CACHE)
+        # Werkzeug의 캐시 구조가 다른 경우, 본문은 view에서 다시 디코딩
+        with mock.patch.object(decoders, "JSON_CACHE", False):
+            res = self.client.post("/echo", json={"name": "iml"})
+        self.assertEqual(res.json, {"name": "iml", "body": {"name": "iml"}})
+        self.assertEqual(len(self.decoded), 1)
+
+    def test_invalid_body(self):
+        res = self.client.post(
+            "/echo", data="{name", content_type="application/json"
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"], "Required [Json] parameter, 'name' not given."
+        )
+
+    def test_not_json(self):
+        res = self.client.post("/echo", data={"name": "iml"})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.decoded, [])
+
+    def test_resolve_decoder(self):
+        self.assertIs(resolve_json_decoder("json"), json.loads)
+        self.assertIs(resolve_json_decoder(json.loads), json.loads)
+        self.assertTrue(callable(resolve_json_decoder("auto")))
+        with self.assertRaises(ImportError):
+            resolve_json_decoder("no_such_json_backend")
+
+
+class CollectErrorsTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+
+        def view(
+                id=Route(int),
+                username=Json(str, rules=[MinLen(5), Regex("^[a-z]+$")]),
+                age=Json(int, rules=Min(18)),
+                token=Header('X-Token', str),
+        ):
+            return {"id": id}
+
+        app.add_url_rule(
+            "/all/<id>", "all", Validator(collect_errors=True)(view),
+            methods=["POST"]
+        )
+        app.add_url_rule(
+            "/capped/<id>", "capped",
+            Validator(collect_errors=True, max_errors=2)(view),
+            methods=["POST"]
+        )
+        self.client = app.test_client()
+
+    def test_collect_errors(self):
+        res = self.client.post("/all/a", json={"username": "IML", "age": 10})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json["error"], [
+            {
+                "source": "Route", "field": "id", "check": "convert",
+                "message": "In [Route] Params, "
+                           "'id' can't be converted to <class 'int'>."
+            },
+            {
+                "source": "Json", "field": "username", "check": "MinLen",
+                "message": "Parameter <username>: "
+                           "must be at least 5 elements."
+            },
+            {
+                "source": "Json", "field": "username", "check": "Regex",
+                "message": "Parameter <username>: "
+                           "pattern does not match: ^[a-z]+$"
+            },
+            {
+                "source": "Json", "field": "age", "check": "Min",
+                "message": "Parameter <age>: must be larger than 18."
+            },
+            {
+                "source": "Header", "field": "X-Token", "check": "required",
+                "message": "Required [Header] parameter, "
+                           "Header 'X-Token' not given."
+            },
+        ])
+
+    def test_max_errors(self):
+        res = self.client.post("/capped/a", json={"username": "IML"})
+        self.assertEqual(
+            [error["check"] for error in res.json["error"]],
+            ["convert", "MinLen"]
+        )
+        for max_errors in (0, -1, "1"):
+            with self.assertRaises(InvalidMaxErrors):
+                Validator(collect_errors=True, max_errors=max_errors)
+
+    def test_valid(self):
+        res = self.client.post(
+            "/all/1", json={"username": "imiml", "age": 20},
+            headers={"X-Token": "secret"}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json, {"id": 1})
+
+
+class Unique(AsyncValidationRule):
+    """Passes only when it runs concurrently with the rule it waits for."""
+
+    def __init__(self, events, name, other, taken):
+        self.events = events
+        self.name = name
+        self.other = other
+        self.taken = taken
+
+    def invalid_str(self):
+        return "is already taken."
+
+    async def is_valid(self, data) -> bool:
+        self.events[self.name].set()
+        await asyncio.wait_for(self.events[self.other].wait(), 1)
+        return data not in self.taken
+
+
+@unittest.skipIf(asgiref is None, "asgiref is not installed")
+class AsyncValidatorTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+        events = {}
+
+        @app.before_request
+        def reset_events():
+            events["username"] = asyncio.Event()
+            events["email"] = asyncio.Event()
+
+        @app.route("/signup", methods=["POST"])
+        @Validator()
+        async def signup(
+                username=Json(str, rules=[
+                    MinLen(3), Unique(events, "username", "email", ["iml"])
+                ]),
+                email=Json(str, rules=Unique(
+                    events, "email", "username", ["a@a.a"]
+                ))
+        ):
+            await asyncio.sleep(0)
+            return {"username": username, "email": email}
+
+        self.client = app.test_client()
+
+    def test_valid(self):
+        res = self.client.post(
+            "/signup", json={"username": "imiml", "email": "b@b.b"}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json, {"username": "imiml", "email": "b@b.b"})
+
+    def test_async_rule_failed(self):
+        res = self.client.post(
+            "/signup", json={"username": "imiml", "email": "a@a.a"}
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"], "Parameter <email>: is already taken."
+        )
+
+    def test_sync_rule_first(self):
+        res = self.client.post(
+            "/signup", json={"username": "im", "email": "b@b.b"}
+        )
+        self.assertEqual(
+            res.json["error"],
+            "Parameter <username>: must be at least 3 elements."
+        )
+
+
+class AsyncRuleTestCase(unittest.TestCase):
+
+    def test_sync_view_rejects_async_rule(self):
+        def view(name=Json(str, rules=Unique({}, 'a', 'b', []))):
+            pass
+        with self.assertRaises(InvalidAsyncRule):
+            Validator()(view)
+
+
+if __name__ == '__main__':
+    unittest.main()
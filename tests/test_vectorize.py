@@ -0,0 +1,156 @@
+import math
+import asyncio
+import unittest
+from flask import Flask
+from flask_validation_extended import Validator
+from flask_validation_extended.params import Json
+from flask_validation_extended.core import compile_params, validate_async
+from flask_validation_extended.rules import (
+    MaxLen, Min, Max, Finite, Each, In, AsyncValidationRule
+)
+from flask_validation_extended.types import List
+from flask_validation_extended.vectorize import array_item, load_numpy
+
+numpy = load_numpy()
+
+
+class IsList(AsyncValidationRule):
+    types = list
+
+    async def is_valid(self, data):
+        return type(data) is list
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class VectorizeTestCase(unittest.TestCase):
+
+    options = {}
+
+    def setUp(self) -> None:
+        app = Flask(__name__)
+
+        def ingest(
+                samples=Json(List(float), rules=MaxLen(100)),
+                counts=Json(List(int), optional=True),
+                levels=Json(List(int), rules=Each(Min(0), Max(10)), optional=True),
+                finites=Json(List(int), rules=Each(Finite()), optional=True),
+                shape=Json(List(int), rules=In([[1, 2, 3, 4, 5]]), optional=True),
+        ):
+            return {
+                "samples": type(samples).__name__,
+                "counts": type(counts).__name__,
+                "shape": type(shape).__name__,
+            }
+
+        app.add_url_rule(
+            "/ingest", "ingest",
+            Validator(numpy_threshold=5, numpy_output=True, **self.options)(ingest),
+            methods=["POST"]
+        )
+        self.client = app.test_client()
+
+    def test_array_item(self):
+        self.assertIs(array_item([List(int)]), int)
+        self.assertIs(array_item([List([float])]), float)
+        for annotation in [[list], [List(str)], [List([int, float])], [List(int), str]]:
+            self.assertIsNone(array_item(annotation))
+
+    def test_output(self):
+        res = self.client.post("/ingest", json={
+            "samples": [1.5] * 10, "counts": [1, 2]
+        })
+        self.assertEqual(
+            res.json, {"samples": "ndarray", "counts": "list", "shape": "NoneType"}
+        )
+
+    def test_rules_on_list(self):
+        # Param의 Rule은 배열이 아닌 list에 적용되고, 마지막에 배열로 변환
+        res = self.client.post("/ingest", json={
+            "samples": [1.5], "shape": [1, 2, 3, 4, 5]
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json["shape"], "ndarray")
+        res = self.client.post("/ingest", json={
+            "samples": [1.5], "shape": [1, 2, 3, 4, 6]
+        })
+        self.assertEqual(res.status_code, 400)
+
+    def test_async_rules_on_list(self):
+        plan = compile_params(
+            {"ids": Json(List(int), rules=IsList())},
+            numpy_threshold=2, numpy_output=True
+        )
+        inputs, error = asyncio.run(
+            validate_async(plan, {"json": {"ids": [1, 2, 3]}})
+        )
+        self.assertIsNone(error)
+        self.assertIsInstance(inputs["ids"], numpy.ndarray)
+
+    def test_type_failed(self):
+        res = self.client.post("/ingest", json={"samples": [1.5] * 9 + [1]})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"], "In [Json] Params, 'samples' is not ['List(float)']."
+        )
+
+    def test_rule_on_array(self):
+        res = self.client.post("/ingest", json={"samples": [1.5] * 101})
+        self.assertEqual(
+            res.json["error"],
+            "Parameter <samples>: must be a maximum of 100 elements."
+        )
+
+    def test_each_on_array(self):
+        for levels in [[1] * 4 + [11], [1] * 9 + [11]]:
+            res = self.client.post("/ingest", json={
+                "samples": [1.5], "levels": levels
+            })
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(
+                res.json["error"],
+                f"Parameter <levels>: item [{len(levels) - 1}] must be smaller than 10."
+            )
+        res = self.client.post("/ingest", json={
+            "samples": [1.5], "levels": [1] * 9 + ["1"]
+        })
+        self.assertEqual(
+            res.json["error"], "In [Json] Params, 'levels' is not ['List(int)']."
+        )
+        res = self.client.post("/ingest", json={
+            "samples": [1.5], "levels": list(range(11))
+        })
+        self.assertEqual(res.status_code, 200)
+
+    def test_big_int(self):
+        # int64 범위를 넘는 정수는 object 배열이 되므로, 원소별로 검사
+        res = self.client.post("/ingest", json={
+            "samples": [1.5], "finites": [1, 2, 3, 4, 2 ** 70]
+        })
+        self.assertEqual(res.status_code, 200)
+        res = self.client.post("/ingest", json={
+            "samples": [1.5], "levels": [1, 2, 3, 4, 2 ** 70]
+        })
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.json["error"], "Parameter <levels>: item [4] must be smaller than 10."
+        )
+
+    def test_array_rules(self):
+        array = numpy.asarray([1.0, 5.0, 10.0])
+        self.assertTrue(Min(1).is_valid_array(array))
+        self.assertFalse(Min(2).is_valid_array(array))
+        self.assertTrue(Max(10).is_valid_array(array))
+        self.assertFalse(Max(9.5).is_valid_array(array))
+        self.assertTrue(Finite().is_valid_array(array))
+        self.assertFalse(Finite().is_valid_array(numpy.asarray([1.0, math.nan])))
+        self.assertTrue(Finite().is_valid(1.5))
+        self.assertFalse(Finite().is_valid(math.inf))
+
+
+class CodegenVectorizeTestCase(VectorizeTestCase):
+
+    options = {"codegen": True}
+
+
+if __name__ == '__main__':
+    unittest.main()